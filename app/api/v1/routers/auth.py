@@ -73,7 +73,7 @@ async def get_me(
         username=current_user.username,
         full_name=current_user.full_name,
         role=current_user.role.value,
-        permissions=current_user.permissions,
+        permissions=sorted(current_user.permissions),
         status=current_user.status.value,
     )
 
@@ -3,6 +3,7 @@ Copilot Plugin API Routes
 """
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 
@@ -66,7 +67,8 @@ class CopilotHealthResponse(BaseModel):
 @router.post("/chat", response_model=CopilotChatResponse)
 async def copilot_chat(
     request: CopilotChatRequest,
-    use_case = Depends(get_process_chat_query_use_case)
+    use_case = Depends(get_process_chat_query_use_case),
+    session: AsyncSession = Depends(get_db_session)
 ):
     """
     Chat endpoint for Copilot plugin
@@ -85,8 +87,10 @@ async def copilot_chat(
             max_sources=request.max_sources
         )
         
-        # Execute use case
-        response = await use_case.execute(use_case_request)
+        # Execute use case as one unit of work on the request session shared with
+        # the use case's repositories; committed here, before the response is sent
+        async with session.begin():
+            response = await use_case.execute(use_case_request)
         
         processing_time = int((datetime.utcnow() - start_time).total_seconds() * 1000)
         
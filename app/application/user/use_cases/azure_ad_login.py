@@ -84,7 +84,7 @@ class AzureADLoginUseCase:
             logger.info(f"Checking if user exists: {azure_ad_user.mail}")
             try:
                 logger.info("About to call find_by_email...")
-                email_value_object = Email(azure_ad_user.mail)
+                email_value_object = Email.get(azure_ad_user.mail)
                 existing_user = await self.user_repository.find_by_email(email_value_object)
                 logger.info(f"find_by_email completed. Existing user found: {existing_user is not None}")
                 
@@ -128,7 +128,7 @@ class AzureADLoginUseCase:
                 user_id=user.id,
                 email=user.email,
                 role=user.role.value if hasattr(user.role, 'value') else str(user.role),
-                permissions=user.permissions or [],
+                permissions=sorted(user.permissions),
                 remember_me=True,  # Azure AD users get refresh tokens
                 additional_claims={
                     "azure_ad_id": azure_ad_user.id,
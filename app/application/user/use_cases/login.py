@@ -52,7 +52,7 @@ class LoginUseCase:
 
     async def execute(self, request: LoginRequest) -> LoginResponse:
         try:
-            email = Email(request.email)
+            email = Email.get(request.email)
         except ValueError as e:
             raise InvalidCredentialsError(f"Invalid email format: {str(e)}")
 
@@ -89,7 +89,7 @@ class LoginUseCase:
             user_id=user.id,
             email=user.email,
             role=user.role.value,
-            permissions=user.permissions,
+            permissions=sorted(user.permissions),
             remember_me=request.remember_me,
         )
 
@@ -128,7 +128,7 @@ class LoginUseCase:
             user_id=user.id,
             email=user.email,
             role=user.role.value,
-            permissions=user.permissions,
+            permissions=sorted(user.permissions),
             remember_me=True,
         )
 
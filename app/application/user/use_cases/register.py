@@ -59,7 +59,7 @@ class RegisterUseCase:
 
     async def execute(self, request: RegisterRequest) -> RegisterResponse:
         try:
-            email = Email(request.email)
+            email = Email.get(request.email)
         except ValueError as e:
             raise RegisterError(f"Invalid email: {str(e)}")
 
@@ -152,7 +152,7 @@ class RegisterUseCase:
             raise RegisterError("Email service not configured")
 
         try:
-            email_obj = Email(email)
+            email_obj = Email.get(email)
         except ValueError as e:
             raise RegisterError(f"Invalid email: {str(e)}")
 
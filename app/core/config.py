@@ -87,6 +87,7 @@ class Settings(BaseSettings):
     database_pool_size: int = Field(default=20, env="DATABASE_POOL_SIZE")
     database_max_overflow: int = Field(default=10, env="DATABASE_MAX_OVERFLOW")
     database_pool_pre_ping: bool = Field(default=True, env="DATABASE_POOL_PRE_PING")
+    database_pool_recycle: int = Field(default=1800, env="DATABASE_POOL_RECYCLE")
     
     # Redis
     redis_url: str = Field(default="redis://localhost:6379/0", env="REDIS_URL")
@@ -146,6 +147,10 @@ class Settings(BaseSettings):
     login_attempts_max: int = Field(default=5, env="LOGIN_ATTEMPTS_MAX")
     login_attempts_window: int = Field(default=900, env="LOGIN_ATTEMPTS_WINDOW")
     
+    # Password policy
+    breached_passwords_bloom_path: Optional[str] = Field(default=None, env="BREACHED_PASSWORDS_BLOOM_PATH")
+    breached_passwords_top_path: Optional[str] = Field(default=None, env="BREACHED_PASSWORDS_TOP_PATH")
+    
     # Logging
     log_level: str = Field(default="INFO", env="LOG_LEVEL")
     log_format: str = Field(default="json", env="LOG_FORMAT")
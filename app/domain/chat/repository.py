@@ -2,7 +2,7 @@
 Chat Repository Interface
 """
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+from typing import AsyncIterator, List, Optional, Dict, Any, Tuple
 from datetime import datetime
 
 from .entities import ChatSession, ChatMessage
@@ -24,8 +24,13 @@ class ChatRepository(ABC):
     @abstractmethod
     async def find_sessions_by_user_id(self, user_id: str, 
                                      limit: Optional[int] = None,
-                                     offset: Optional[int] = None) -> List[ChatSession]:
-        """Find chat sessions by user ID"""
+                                     offset: Optional[int] = None,
+                                     cursor: Optional[Tuple[datetime, str]] = None) -> List[ChatSession]:
+        """
+        Find chat sessions by user ID, newest first.
+        cursor is the (updated_at, id) of the last session already seen;
+        it cannot be combined with offset.
+        """
         pass
     
     @abstractmethod
@@ -39,10 +44,10 @@ class ChatRepository(ABC):
         pass
     
     @abstractmethod
-    async def find_messages_by_session_id(self, session_id: str,
-                                        limit: Optional[int] = None,
-                                        offset: Optional[int] = None) -> List[ChatMessage]:
-        """Find messages by session ID"""
+    def find_messages_by_session_id(self, session_id: str,
+                                  limit: Optional[int] = None,
+                                  offset: Optional[int] = None) -> AsyncIterator[ChatMessage]:
+        """Stream messages by session ID (async generator)"""
         pass
     
     @abstractmethod
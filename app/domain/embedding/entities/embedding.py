@@ -6,8 +6,13 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional, Dict, Any
 
+import orjson
+
 from .value_objects import EmbeddingStatus, EmbeddingType, EmbeddingVector, EmbeddingMetadata
 
+# Wire-format string per embedding type, looked up on each serialization
+_EMBEDDING_TYPE_NAMES = {embedding_type: embedding_type.value for embedding_type in EmbeddingType}
+
 
 @dataclass
 class Embedding:
@@ -91,14 +96,14 @@ class Embedding:
         """Check if embedding is image type"""
         return self.embedding_type == EmbeddingType.IMAGE
     
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary representation"""
+    def _payload(self) -> Dict[str, Any]:
+        """Build serialization payload with raw vector values and datetimes"""
         return {
             "id": self.id,
-            "embedding_type": self.embedding_type.value,
-            "status": self.status.value,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat(),
+            "embedding_type": _EMBEDDING_TYPE_NAMES[self.embedding_type],
+            "status": EmbeddingStatus.name_of(self.status),
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
             "version": self.version,
             "vector": {
                 "dimension": self.vector.dimension,
@@ -115,6 +120,20 @@ class Embedding:
             "tags": self.tags
         }
     
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary representation"""
+        result = self._payload()
+        result["created_at"] = self.created_at.isoformat()
+        result["updated_at"] = self.updated_at.isoformat()
+        values = self.vector.values
+        if hasattr(values, "tolist"):
+            result["vector"]["values"] = values.tolist()
+        return result
+    
+    def to_json_bytes(self) -> bytes:
+        """Serialize to JSON bytes without building an intermediate list of floats"""
+        return orjson.dumps(self._payload(), option=orjson.OPT_SERIALIZE_NUMPY)
+    
     def to_search_result(self, score: Optional[float] = None) -> Dict[str, Any]:
         """Convert to search result format"""
         result = self.to_dict()
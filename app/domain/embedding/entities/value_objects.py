@@ -1,18 +1,35 @@
 """
 Embedding Domain Value Objects
 """
-from enum import Enum
+from enum import Enum, IntEnum
 from dataclasses import dataclass
 from typing import List, Optional, Dict, Any
 import numpy as np
 
 
-class EmbeddingStatus(str, Enum):
-    """Embedding processing status"""
-    PENDING = "pending"
-    PROCESSING = "processing"
-    COMPLETED = "completed"
-    FAILED = "failed"
+class EmbeddingStatus(IntEnum):
+    """
+    Embedding processing status
+    Integer-coded for cheap comparisons; serialized by its lowercase name
+    """
+    PENDING = 0
+    PROCESSING = 1
+    COMPLETED = 2
+    FAILED = 3
+    
+    @classmethod
+    def name_of(cls, status: int) -> str:
+        """Get wire-format name for a status code"""
+        return _EMBEDDING_STATUS_NAMES[status]
+    
+    @classmethod
+    def from_name(cls, name: str) -> "EmbeddingStatus":
+        """Parse wire-format name into a status"""
+        return _EMBEDDING_STATUS_BY_NAME[name]
+
+
+_EMBEDDING_STATUS_NAMES = tuple(status.name.lower() for status in EmbeddingStatus)
+_EMBEDDING_STATUS_BY_NAME = {status.name.lower(): status for status in EmbeddingStatus}
 
 
 class EmbeddingType(str, Enum):
@@ -7,6 +7,8 @@ from datetime import datetime
 
 from .entities import Embedding, EmbeddingModel
 
+__all__ = ["EmbeddingRepository"]
+
 
 class EmbeddingRepository(ABC):
     """Abstract Embedding Repository interface"""
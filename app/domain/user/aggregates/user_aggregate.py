@@ -12,7 +12,7 @@ from app.domain.user.entities.user import User, UserRole, UserStatus
 from app.domain.user.entities.user_profile import UserProfile
 from app.domain.user.entities.session import Session
 from app.domain.user.entities.permission import Permission, get_default_permissions
-from app.domain.user.value_objects.email import Email
+from app.domain.user.value_objects.email import MAX_EMAIL_LENGTH, is_valid_email
 from app.domain.user.value_objects.password import Password
 
 
@@ -81,9 +81,7 @@ class UserAggregate:
         self.profile = UserProfile.create_for_user(self.user.id)
         
         # 4. Set default permissions based on role
-        self.permissions = get_default_permissions(self.user.role.value)
-        for permission in self.permissions:
-            permission.user_id = self.user.id
+        self.permissions = get_default_permissions(self.user.role.value, user_id=self.user.id)
         
         # 5. Activate account for testing
         self.user.activate()
@@ -135,9 +133,7 @@ class UserAggregate:
         self.user.update_role(new_role)
         
         # 3. Update permissions accordingly
-        self.permissions = get_default_permissions(new_role.value)
-        for permission in self.permissions:
-            permission.user_id = self.user.id
+        self.permissions = get_default_permissions(new_role.value, user_id=self.user.id)
         
         # 4. Invalidate existing sessions
         self._invalidate_sessions()
@@ -216,21 +212,20 @@ class UserAggregate:
     
     def _validate_registration_data(self, email: str, password: str, full_name: str) -> bool:
         """Validate registration data"""
-        try:
-            # Validate email
-            Email(email)
-            
-            # Validate password - use a simpler validation for testing
-            if not password or len(password) < 8:
-                return False
-            
-            # Validate full name
-            if not full_name or len(full_name.strip()) < 2:
-                return False
-            
-            return True
-        except ValueError:
+        # Validate email
+        email = (email or "").strip()
+        if not email or len(email) > MAX_EMAIL_LENGTH or not is_valid_email(email):
             return False
+        
+        # Validate password - use a simpler validation for testing
+        if not password or len(password) < 8:
+            return False
+        
+        # Validate full name
+        if not full_name or len(full_name.strip()) < 2:
+            return False
+        
+        return True
     
     def _invalidate_sessions(self) -> None:
         """Invalidate all existing sessions"""
@@ -0,0 +1,33 @@
+"""
+Time helpers for the User aggregate
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Iterator, Optional
+
+# Shared timestamp for entities created inside a batch_now() block
+_batch_now: ContextVar[Optional[datetime]] = ContextVar("batch_now", default=None)
+
+
+def utc_now() -> datetime:
+    """Get current naive-UTC time, or the enclosing batch's timestamp"""
+    value = _batch_now.get()
+    return value if value is not None else datetime.utcnow()
+
+
+@contextmanager
+def batch_now() -> Iterator[datetime]:
+    """Make every utc_now() call inside the block return one shared timestamp"""
+    token = _batch_now.set(datetime.utcnow())
+    try:
+        yield _batch_now.get()
+    finally:
+        _batch_now.reset(token)
+
+
+def utc_timestamp(value: datetime) -> float:
+    """Get epoch seconds for a naive-UTC (or timezone-aware) datetime"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
@@ -2,14 +2,18 @@
 User Permission Entity
 Part of User Aggregate
 """
+import operator
+import time
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Optional, List
 from enum import Enum
-import uuid
 
+from app.domain.user.clock import batch_now, utc_now, utc_timestamp
+from app.domain.user.ids import new_id
 
-class PermissionType(Enum):
+
+class PermissionType(str, Enum):
     """Permission types"""
     READ = "read"
     WRITE = "write"
@@ -17,7 +21,7 @@ class PermissionType(Enum):
     ADMIN = "admin"
 
 
-class PermissionScope(Enum):
+class PermissionScope(str, Enum):
     """Permission scopes"""
     DOCUMENTS = "documents"
     USERS = "users"
@@ -26,7 +30,7 @@ class PermissionScope(Enum):
     SYSTEM = "system"
 
 
-@dataclass
+@dataclass(slots=True)
 class Permission:
     """
     User Permission Entity
@@ -39,18 +43,36 @@ class Permission:
     scope: PermissionScope
     resource: Optional[str] = None
     conditions: dict = field(default_factory=dict)
-    granted_at: datetime = field(default_factory=datetime.utcnow)
+    granted_at: datetime = field(default_factory=utc_now)
     granted_by: Optional[str] = None
     expires_at: Optional[datetime] = None
     is_active: bool = True
     
+    # Derived once in __post_init__: name, type and scope are fixed after creation,
+    # and expires_at changes only through extend(), which keeps _expires_ts in sync.
+    # Assigning these fields directly is unsupported.
+    # (name, type, scope) key compared in a single tuple compare by matches()
+    _match_key: tuple = field(init=False, repr=False, compare=False)
+    # expires_at as epoch seconds (None = never expires)
+    _expires_ts: Optional[float] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        """Precompute match key and expiry timestamp after creation"""
+        self._match_key = (self.name, self.type, self.scope)
+        self._expires_ts = utc_timestamp(self.expires_at) if self.expires_at else None
+    
+    @property
+    def match_key(self) -> tuple:
+        """Get (name, type, scope) key, usable for dict-based permission indexes"""
+        return self._match_key
+    
     @classmethod
     def create(cls, user_id: str, name: str, type: PermissionType, 
                scope: PermissionScope, resource: Optional[str] = None,
                granted_by: Optional[str] = None) -> "Permission":
         """Create new permission"""
         return cls(
-            id=str(uuid.uuid4()),
+            id=new_id(),
             user_id=user_id,
             name=name,
             type=type,
@@ -61,9 +83,8 @@ class Permission:
     
     def is_expired(self) -> bool:
         """Check if permission is expired"""
-        if not self.expires_at:
-            return False
-        return datetime.utcnow() > self.expires_at
+        expires_ts = self._expires_ts
+        return expires_ts is not None and time.time() > expires_ts
     
     def is_valid(self) -> bool:
         """Check if permission is valid (active and not expired)"""
@@ -75,14 +96,9 @@ class Permission:
     
     def extend(self, days: int) -> None:
         """Extend permission expiration"""
-        if self.expires_at:
-            self.expires_at = self.expires_at.replace(
-                day=self.expires_at.day + days
-            )
-        else:
-            self.expires_at = datetime.utcnow().replace(
-                day=datetime.utcnow().day + days
-            )
+        base = self.expires_at or datetime.utcnow()
+        self.expires_at = base + timedelta(days=days)
+        self._expires_ts = utc_timestamp(self.expires_at)
     
     def matches(self, required_name: str, required_type: PermissionType, 
                 required_scope: PermissionScope, resource: Optional[str] = None) -> bool:
@@ -91,9 +107,7 @@ class Permission:
             return False
         
         # Check name, type, and scope
-        if (self.name != required_name or 
-            self.type != required_type or 
-            self.scope != required_scope):
+        if self._match_key != (required_name, required_type, required_scope):
             return False
         
         # Check resource if specified
@@ -102,22 +116,20 @@ class Permission:
         
         return True
     
+    # Attributes read by to_dict in a single attrgetter call
+    _TO_DICT_KEYS = (
+        "id", "user_id", "name", "type", "scope", "resource", "conditions",
+        "granted_at", "granted_by", "expires_at", "is_active"
+    )
+    _TO_DICT_GET = operator.attrgetter(*_TO_DICT_KEYS)
+    
     def to_dict(self) -> dict:
         """Convert to dictionary"""
-        return {
-            "id": self.id,
-            "user_id": self.user_id,
-            "name": self.name,
-            "type": self.type.value,
-            "scope": self.scope.value,
-            "resource": self.resource,
-            "conditions": self.conditions,
-            "granted_at": self.granted_at.isoformat(),
-            "granted_by": self.granted_by,
-            "expires_at": self.expires_at.isoformat() if self.expires_at else None,
-            "is_active": self.is_active,
-            "is_valid": self.is_valid()
-        }
+        payload = dict(zip(self._TO_DICT_KEYS, self._TO_DICT_GET(self)))
+        payload["granted_at"] = self.granted_at.isoformat()
+        payload["expires_at"] = self.expires_at.isoformat() if self.expires_at else None
+        payload["is_valid"] = self.is_valid()
+        return payload
 
 
 # Predefined permissions
@@ -149,55 +161,59 @@ class Permissions:
     CONFIG_SYSTEM = "config:system"
 
 
-def get_default_permissions(role: str) -> List[Permission]:
+# Default (name, type, scope) permission templates per role, built once at import
+_ADMIN_PERMISSION_TEMPLATES = tuple(
+    (
+        name,
+        PermissionType.ADMIN if "admin" in name else PermissionType.READ,
+        PermissionScope.SYSTEM if "system" in name else PermissionScope.DOCUMENTS,
+    )
+    for name in (
+        Permissions.READ_DOCUMENTS, Permissions.WRITE_DOCUMENTS,
+        Permissions.DELETE_DOCUMENTS, Permissions.UPLOAD_DOCUMENTS,
+        Permissions.READ_USERS, Permissions.WRITE_USERS,
+        Permissions.DELETE_USERS, Permissions.MANAGE_USERS,
+        Permissions.USE_CHAT, Permissions.MANAGE_CHAT,
+        Permissions.VIEW_ANALYTICS, Permissions.EXPORT_ANALYTICS,
+        Permissions.SYSTEM_ADMIN, Permissions.CONFIG_SYSTEM
+    )
+)
+
+_MANAGER_PERMISSION_TEMPLATES = tuple(
+    (
+        name,
+        PermissionType.WRITE if "write" in name or "manage" in name else PermissionType.READ,
+        PermissionScope.DOCUMENTS,
+    )
+    for name in (
+        Permissions.READ_DOCUMENTS, Permissions.WRITE_DOCUMENTS,
+        Permissions.DELETE_DOCUMENTS, Permissions.UPLOAD_DOCUMENTS,
+        Permissions.READ_USERS, Permissions.WRITE_USERS,
+        Permissions.USE_CHAT, Permissions.MANAGE_CHAT,
+        Permissions.VIEW_ANALYTICS, Permissions.EXPORT_ANALYTICS
+    )
+)
+
+_USER_PERMISSION_TEMPLATES = tuple(
+    (name, PermissionType.READ, PermissionScope.DOCUMENTS)
+    for name in (
+        Permissions.READ_DOCUMENTS, Permissions.UPLOAD_DOCUMENTS,
+        Permissions.USE_CHAT
+    )
+)
+
+_ROLE_PERMISSION_TEMPLATES = {
+    "admin": _ADMIN_PERMISSION_TEMPLATES,
+    "manager": _MANAGER_PERMISSION_TEMPLATES,
+}
+
+
+def get_default_permissions(role: str, user_id: str = "") -> List[Permission]:
     """Get default permissions for user role"""
-    permissions = []
-    
-    if role == "admin":
-        # Admin gets all permissions
-        for permission_name in [
-            Permissions.READ_DOCUMENTS, Permissions.WRITE_DOCUMENTS,
-            Permissions.DELETE_DOCUMENTS, Permissions.UPLOAD_DOCUMENTS,
-            Permissions.READ_USERS, Permissions.WRITE_USERS,
-            Permissions.DELETE_USERS, Permissions.MANAGE_USERS,
-            Permissions.USE_CHAT, Permissions.MANAGE_CHAT,
-            Permissions.VIEW_ANALYTICS, Permissions.EXPORT_ANALYTICS,
-            Permissions.SYSTEM_ADMIN, Permissions.CONFIG_SYSTEM
-        ]:
-            permissions.append(Permission.create(
-                user_id="",  # Will be set when creating user
-                name=permission_name,
-                type=PermissionType.ADMIN if "admin" in permission_name else PermissionType.READ,
-                scope=PermissionScope.SYSTEM if "system" in permission_name else PermissionScope.DOCUMENTS
-            ))
-    
-    elif role == "manager":
-        # Manager gets most permissions except system admin
-        for permission_name in [
-            Permissions.READ_DOCUMENTS, Permissions.WRITE_DOCUMENTS,
-            Permissions.DELETE_DOCUMENTS, Permissions.UPLOAD_DOCUMENTS,
-            Permissions.READ_USERS, Permissions.WRITE_USERS,
-            Permissions.USE_CHAT, Permissions.MANAGE_CHAT,
-            Permissions.VIEW_ANALYTICS, Permissions.EXPORT_ANALYTICS
-        ]:
-            permissions.append(Permission.create(
-                user_id="",
-                name=permission_name,
-                type=PermissionType.WRITE if "write" in permission_name or "manage" in permission_name else PermissionType.READ,
-                scope=PermissionScope.DOCUMENTS
-            ))
-    
-    else:  # user role
-        # Regular user gets basic permissions
-        for permission_name in [
-            Permissions.READ_DOCUMENTS, Permissions.UPLOAD_DOCUMENTS,
-            Permissions.USE_CHAT
-        ]:
-            permissions.append(Permission.create(
-                user_id="",
-                name=permission_name,
-                type=PermissionType.READ,
-                scope=PermissionScope.DOCUMENTS
-            ))
-    
-    return permissions
+    # Any other role gets the basic user permissions
+    templates = _ROLE_PERMISSION_TEMPLATES.get(role, _USER_PERMISSION_TEMPLATES)
+    with batch_now():
+        return [
+            Permission.create(user_id=user_id, name=name, type=type, scope=scope)
+            for name, type, scope in templates
+        ]
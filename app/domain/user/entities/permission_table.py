@@ -0,0 +1,188 @@
+"""
+Permission Table
+Struct-of-arrays store for many permissions, for bulk matching (role sync,
+audits) where calling Permission.matches per object dominates.
+Not exported from app.domain.user.entities, so importing the entities does
+not pull in NumPy; import it from this module. numba is optional (poetry
+extra "jit", or pip install numba==0.58.1) and only used when installed.
+"""
+import time
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from app.domain.user.entities.permission import Permission, PermissionScope, PermissionType
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional, fall back to NumPy
+    njit = None
+
+
+_TYPES: List[PermissionType] = list(PermissionType)
+_SCOPES: List[PermissionScope] = list(PermissionScope)
+_TYPE_CODES: Dict[PermissionType, int] = {t: i for i, t in enumerate(_TYPES)}
+_SCOPE_CODES: Dict[PermissionScope, int] = {s: i for i, s in enumerate(_SCOPES)}
+
+# expires_ts value for permissions that never expire
+_NEVER = np.inf
+
+
+def _match_mask_numpy(names, types, scopes, active, expires, now, want_n, want_t, want_s):
+    return active & (expires > now) & (names == want_n) & (types == want_t) & (scopes == want_s)
+
+
+if njit is not None:
+    @njit(cache=True, parallel=True)
+    def _match_mask(names, types, scopes, active, expires, now, want_n, want_t, want_s):
+        out = np.empty(names.shape, np.bool_)
+        for i in prange(names.shape[0]):
+            out[i] = (active[i] and expires[i] > now and names[i] == want_n
+                      and types[i] == want_t and scopes[i] == want_s)
+        return out
+else:
+    _match_mask = _match_mask_numpy
+
+
+class PermissionTable:
+    """
+    Permissions stored column-wise: integer-coded name/type/scope plus
+    active/expiry arrays for scans, and plain lists for the remaining fields.
+    Row i of every column describes the same permission; table[i] rebuilds it.
+    """
+
+    __slots__ = (
+        "_size", "_capacity", "_name_codes", "_id_to_row",
+        "_names", "_types", "_scopes", "_active", "_expires_ts",
+        "_ids", "_user_ids", "_name_values", "_resources", "_conditions",
+        "_granted_at", "_granted_by", "_expires_at",
+    )
+
+    def __init__(self, initial_capacity: int = 16) -> None:
+        self._size = 0
+        self._capacity = max(initial_capacity, 1)
+        self._name_codes: Dict[str, int] = {}
+        self._id_to_row: Dict[str, int] = {}
+
+        # Scan columns
+        self._names = np.empty(self._capacity, dtype=np.int32)
+        self._types = np.empty(self._capacity, dtype=np.uint8)
+        self._scopes = np.empty(self._capacity, dtype=np.uint8)
+        self._active = np.empty(self._capacity, dtype=np.bool_)
+        self._expires_ts = np.empty(self._capacity, dtype=np.float64)
+
+        # Remaining fields, only read when a row is materialized
+        self._ids: List[str] = []
+        self._user_ids: List[str] = []
+        self._name_values: List[str] = []
+        self._resources: List[Optional[str]] = []
+        self._conditions: List[dict] = []
+        self._granted_at: list = []
+        self._granted_by: List[Optional[str]] = []
+        self._expires_at: list = []
+
+    @classmethod
+    def from_permissions(cls, permissions: Iterable[Permission]) -> "PermissionTable":
+        """Build a table from existing Permission entities"""
+        permissions = list(permissions)
+        table = cls(initial_capacity=len(permissions))
+        for permission in permissions:
+            table.add(permission)
+        return table
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, row: int) -> Permission:
+        """Materialize the Permission stored at row"""
+        if not -self._size <= row < self._size:
+            raise IndexError("PermissionTable index out of range")
+        row %= self._size
+        return Permission(
+            id=self._ids[row],
+            user_id=self._user_ids[row],
+            name=self._name_values[row],
+            type=_TYPES[self._types[row]],
+            scope=_SCOPES[self._scopes[row]],
+            resource=self._resources[row],
+            conditions=self._conditions[row],
+            granted_at=self._granted_at[row],
+            granted_by=self._granted_by[row],
+            expires_at=self._expires_at[row],
+            is_active=bool(self._active[row]),
+        )
+
+    def row_of(self, permission_id: str) -> Optional[int]:
+        """Get the row holding a permission id"""
+        return self._id_to_row.get(permission_id)
+
+    def _grow(self) -> None:
+        capacity = self._capacity * 2
+        for column in ("_names", "_types", "_scopes", "_active", "_expires_ts"):
+            old = getattr(self, column)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[: self._size] = old[: self._size]
+            setattr(self, column, new)
+        self._capacity = capacity
+
+    def add(self, permission: Permission) -> int:
+        """Add a permission, replacing the row of an existing id; return its row"""
+        row = self._id_to_row.get(permission.id)
+        if row is None:
+            if self._size == self._capacity:
+                self._grow()
+            row = self._size
+            for column in (self._ids, self._user_ids, self._name_values, self._resources,
+                           self._conditions, self._granted_at, self._granted_by, self._expires_at):
+                column.append(None)
+            self._id_to_row[permission.id] = row
+            self._size += 1
+
+        self._names[row] = self._name_codes.setdefault(permission.name, len(self._name_codes))
+        self._types[row] = _TYPE_CODES[permission.type]
+        self._scopes[row] = _SCOPE_CODES[permission.scope]
+        self._active[row] = permission.is_active
+        self._expires_ts[row] = permission._expires_ts if permission._expires_ts is not None else _NEVER
+
+        self._ids[row] = permission.id
+        self._user_ids[row] = permission.user_id
+        self._name_values[row] = permission.name
+        self._resources[row] = permission.resource
+        self._conditions[row] = permission.conditions
+        self._granted_at[row] = permission.granted_at
+        self._granted_by[row] = permission.granted_by
+        self._expires_at[row] = permission.expires_at
+        return row
+
+    def match_mask(self, name: str, type: PermissionType, scope: PermissionScope,
+                   now: Optional[float] = None) -> np.ndarray:
+        """Get a boolean mask of valid permissions matching (name, type, scope)"""
+        name_code = self._name_codes.get(name)
+        if name_code is None:
+            return np.zeros(self._size, dtype=np.bool_)
+        size = self._size
+        return _match_mask(
+            self._names[:size], self._types[:size], self._scopes[:size],
+            self._active[:size], self._expires_ts[:size],
+            time.time() if now is None else now,
+            name_code, _TYPE_CODES[type], _SCOPE_CODES[scope],
+        )
+
+    def matching_rows(self, name: str, type: PermissionType, scope: PermissionScope,
+                      resource: Optional[str] = None, now: Optional[float] = None) -> np.ndarray:
+        """Get rows for which Permission.matches would return True"""
+        rows = np.flatnonzero(self.match_mask(name, type, scope, now))
+        if resource:
+            resources = self._resources
+            rows = rows[[not resources[row] or resources[row] == resource for row in rows]]
+        return rows
+
+    def matches_any(self, name: str, type: PermissionType, scope: PermissionScope,
+                    resource: Optional[str] = None, now: Optional[float] = None) -> bool:
+        """Check if any valid permission matches the required criteria"""
+        return self.matching_rows(name, type, scope, resource, now).size > 0
+
+    def find_matching(self, name: str, type: PermissionType, scope: PermissionScope,
+                      resource: Optional[str] = None) -> List[Permission]:
+        """Get materialized permissions for which Permission.matches would return True"""
+        return [self[row] for row in self.matching_rows(name, type, scope, resource)]
@@ -2,13 +2,21 @@
 User Session Entity
 Part of User Aggregate
 """
+import operator
+import sys
+import time
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
-import uuid
 
+from app.domain.user.clock import utc_now, utc_timestamp
+from app.domain.user.ids import new_id
 
-@dataclass
+# Common device info keys, interned so lookups with literal keys hit the identity fast path
+_DEVICE_INFO_KEYS = {key: sys.intern(key) for key in ("os", "browser", "device", "app_version", "ip")}
+
+
+@dataclass(slots=True)
 class Session:
     """
     User Session Entity
@@ -22,9 +30,17 @@ class Session:
     ip_address: Optional[str] = None
     user_agent: Optional[str] = None
     is_active: bool = True
-    expires_at: datetime = field(default_factory=datetime.utcnow)
-    created_at: datetime = field(default_factory=datetime.utcnow)
-    last_activity: datetime = field(default_factory=datetime.utcnow)
+    expires_at: datetime = field(default_factory=utc_now)
+    created_at: datetime = field(default_factory=utc_now)
+    last_activity: datetime = field(default_factory=utc_now)
+    
+    # expires_at as epoch seconds for cheap validity checks. Only refresh() keeps it
+    # in sync, so change expires_at through refresh(), not by direct assignment
+    _expires_ts: float = field(default=0.0, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        """Precompute expiry timestamp after creation"""
+        self._expires_ts = utc_timestamp(self.expires_at)
     
     @classmethod
     def create_for_user(cls, user_id: str, token: str, refresh_token: Optional[str] = None,
@@ -33,21 +49,23 @@ class Session:
                        user_agent: Optional[str] = None,
                        expires_in_hours: int = 24) -> "Session":
         """Create new session for user"""
+        now = utc_now()
         return cls(
-            id=str(uuid.uuid4()),
+            id=new_id(),
             user_id=user_id,
             token=token,
             refresh_token=refresh_token,
             device_info=device_info or {},
             ip_address=ip_address,
             user_agent=user_agent,
-            expires_at=datetime.utcnow() + timedelta(hours=expires_in_hours),
-            last_activity=datetime.utcnow()
+            expires_at=now + timedelta(hours=expires_in_hours),
+            created_at=now,
+            last_activity=now
         )
     
     def is_expired(self) -> bool:
         """Check if session is expired"""
-        return datetime.utcnow() > self.expires_at
+        return time.time() > self._expires_ts
     
     def is_valid(self) -> bool:
         """Check if session is valid (active and not expired)"""
@@ -59,8 +77,10 @@ class Session:
         self.token = new_token
         if new_refresh_token:
             self.refresh_token = new_refresh_token
-        self.expires_at = datetime.utcnow() + timedelta(hours=expires_in_hours)
-        self.last_activity = datetime.utcnow()
+        now = datetime.utcnow()
+        self.expires_at = now + timedelta(hours=expires_in_hours)
+        self._expires_ts = utc_timestamp(self.expires_at)
+        self.last_activity = now
     
     def update_activity(self) -> None:
         """Update last activity timestamp"""
@@ -72,26 +92,28 @@ class Session:
     
     def update_device_info(self, device_info: Dict[str, Any]) -> None:
         """Update device information"""
-        self.device_info.update(device_info)
+        current = self.device_info if self.device_info is not None else {}
+        for key, value in device_info.items():
+            current[_DEVICE_INFO_KEYS.get(key, key)] = value
+        self.device_info = current
         self.last_activity = datetime.utcnow()
     
     def get_remaining_time(self) -> timedelta:
         """Get remaining time until expiration"""
         return self.expires_at - datetime.utcnow()
     
+    # Attributes read by to_dict in a single attrgetter call
+    _TO_DICT_KEYS = (
+        "id", "user_id", "token", "refresh_token", "device_info", "ip_address",
+        "user_agent", "is_active", "expires_at", "created_at", "last_activity"
+    )
+    _TO_DICT_GET = operator.attrgetter(*_TO_DICT_KEYS)
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
-        return {
-            "id": self.id,
-            "user_id": self.user_id,
-            "token": self.token,
-            "refresh_token": self.refresh_token,
-            "device_info": self.device_info,
-            "ip_address": self.ip_address,
-            "user_agent": self.user_agent,
-            "is_active": self.is_active,
-            "expires_at": self.expires_at.isoformat(),
-            "created_at": self.created_at.isoformat(),
-            "last_activity": self.last_activity.isoformat(),
-            "remaining_time": self.get_remaining_time().total_seconds()
-        }
+        payload = dict(zip(self._TO_DICT_KEYS, self._TO_DICT_GET(self)))
+        payload["expires_at"] = self.expires_at.isoformat()
+        payload["created_at"] = self.created_at.isoformat()
+        payload["last_activity"] = self.last_activity.isoformat()
+        payload["remaining_time"] = self.get_remaining_time().total_seconds()
+        return payload
@@ -1,11 +1,14 @@
 """
 User Entity - Core business object
 """
+import operator
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Optional, List
-from uuid import uuid4
+from typing import Iterable, Optional, Set
+
+from app.domain.user.clock import utc_now
+from app.domain.user.ids import new_id
 
 
 class UserRole(str, Enum):
@@ -24,7 +27,28 @@ class UserStatus(str, Enum):
     PENDING = "pending"
 
 
-@dataclass
+_BASE_PERMISSIONS = ("read:public", "read:profile")
+
+_ROLE_PERMISSIONS = {
+    UserRole.GUEST: (),
+    UserRole.VIEWER: ("read:documents", "read:analytics"),
+    UserRole.USER: (
+        "read:documents",
+        "write:documents",
+        "read:analytics",
+        "use:chat"
+    ),
+    UserRole.ADMIN: (
+        "read:all",
+        "write:all",
+        "delete:all",
+        "manage:users",
+        "manage:system"
+    ),
+}
+
+
+@dataclass(slots=True, eq=False)
 class User:
     """
     User entity with business logic
@@ -43,9 +67,18 @@ class User:
     email_verified: bool = False
     phone: Optional[str] = None
     department: Optional[str] = None
-    permissions: List[str] = field(default_factory=list)
+    permissions: Set[str] = field(default_factory=set)
     metadata: dict = field(default_factory=dict)
     
+    # hash(id), computed once since id never changes after construction
+    _id_hash: int = field(default=0, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        """Normalize permissions given as any iterable (e.g. a JSON list) to a set"""
+        if not isinstance(self.permissions, set):
+            self.permissions = set(self.permissions)
+        self._id_hash = hash(self.id)
+    
     @classmethod
     def create(
         cls,
@@ -56,9 +89,9 @@ class User:
         role: UserRole = UserRole.USER,
     ) -> "User":
         """Factory method to create a new user"""
-        now = datetime.utcnow()
+        now = utc_now()
         return cls(
-            id=str(uuid4()),
+            id=new_id(),
             email=email.lower(),
             username=username.lower(),
             full_name=full_name,
@@ -73,9 +106,9 @@ class User:
     @classmethod
     def create_empty(cls) -> "User":
         """Factory method to create an empty user for aggregate initialization"""
-        now = datetime.utcnow()
+        now = utc_now()
         return cls(
-            id=str(uuid4()),
+            id=new_id(),
             email="",
             username="",
             full_name="",
@@ -84,33 +117,13 @@ class User:
             status=UserStatus.PENDING,
             created_at=now,
             updated_at=now,
-            permissions=[],
+            permissions=set(),
         )
     
     @staticmethod
-    def _get_default_permissions(role: UserRole) -> List[str]:
+    def _get_default_permissions(role: UserRole) -> Set[str]:
         """Get default permissions based on role"""
-        base_permissions = ["read:public", "read:profile"]
-        
-        role_permissions = {
-            UserRole.GUEST: [],
-            UserRole.VIEWER: ["read:documents", "read:analytics"],
-            UserRole.USER: [
-                "read:documents", 
-                "write:documents", 
-                "read:analytics",
-                "use:chat"
-            ],
-            UserRole.ADMIN: [
-                "read:all", 
-                "write:all", 
-                "delete:all", 
-                "manage:users",
-                "manage:system"
-            ],
-        }
-        
-        return base_permissions + role_permissions.get(role, [])
+        return set(_BASE_PERMISSIONS).union(_ROLE_PERMISSIONS.get(role, ()))
     
     def can_access(self, resource: str, action: str = "read") -> bool:
         """
@@ -122,20 +135,25 @@ class User:
         if self.role == UserRole.ADMIN:
             return True
         
-        permission = f"{action}:{resource}"
-        
-        # Check specific permission
-        if permission in self.permissions:
-            return True
-        
-        # Check wildcard permissions
-        if f"{action}:all" in self.permissions:
-            return True
-        
-        if f"*:{resource}" in self.permissions:
-            return True
-        
-        return False
+        # Check specific permission, then wildcard permissions
+        permissions = self.permissions
+        return (
+            f"{action}:{resource}" in permissions
+            or f"{action}:all" in permissions
+            or f"*:{resource}" in permissions
+        )
+    
+    def has_any(self, permissions: Iterable[str]) -> bool:
+        """Check if user holds any of the given permissions"""
+        if not isinstance(permissions, (set, frozenset)):
+            permissions = frozenset(permissions)
+        return not self.permissions.isdisjoint(permissions)
+    
+    def has_all(self, permissions: Iterable[str]) -> bool:
+        """Check if user holds all of the given permissions"""
+        if not isinstance(permissions, (set, frozenset)):
+            permissions = frozenset(permissions)
+        return permissions <= self.permissions
     
     def can_manage_user(self, target_user: "User") -> bool:
         """
@@ -190,16 +208,18 @@ class User:
         if self.id == suspended_by.id:
             raise ValueError("Users cannot suspend themselves")
         
+        now = datetime.utcnow()
         self.status = UserStatus.SUSPENDED
         self.metadata["suspension_reason"] = reason
         self.metadata["suspended_by"] = suspended_by.id
-        self.metadata["suspended_at"] = datetime.utcnow().isoformat()
-        self.updated_at = datetime.utcnow()
+        self.metadata["suspended_at"] = now.isoformat()
+        self.updated_at = now
     
     def update_last_login(self) -> None:
         """Update last login timestamp"""
-        self.last_login = datetime.utcnow()
-        self.updated_at = datetime.utcnow()
+        now = datetime.utcnow()
+        self.last_login = now
+        self.updated_at = now
     
     def is_active(self) -> bool:
         """Check if user account is active"""
@@ -222,7 +242,7 @@ class User:
             raise PermissionError("Only admins can grant permissions")
         
         if permission not in self.permissions:
-            self.permissions.append(permission)
+            self.permissions.add(permission)
             self.updated_at = datetime.utcnow()
     
     def remove_permission(self, permission: str, revoked_by: "User") -> None:
@@ -233,31 +253,30 @@ class User:
             raise PermissionError("Only admins can revoke permissions")
         
         if permission in self.permissions:
-            self.permissions.remove(permission)
+            self.permissions.discard(permission)
             self.updated_at = datetime.utcnow()
     
+    # Attributes read by to_dict in a single attrgetter call
+    _TO_DICT_KEYS = (
+        "id", "email", "username", "full_name", "role", "status", "created_at",
+        "updated_at", "last_login", "email_verified", "phone", "department",
+        "permissions"
+    )
+    _TO_DICT_GET = operator.attrgetter(*_TO_DICT_KEYS)
+    
     def to_dict(self) -> dict:
         """Convert to dictionary (for serialization)"""
-        return {
-            "id": self.id,
-            "email": self.email,
-            "username": self.username,
-            "full_name": self.full_name,
-            "role": self.role.value,
-            "status": self.status.value,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat(),
-            "last_login": self.last_login.isoformat() if self.last_login else None,
-            "email_verified": self.email_verified,
-            "phone": self.phone,
-            "department": self.department,
-            "permissions": self.permissions,
-        }
+        payload = dict(zip(self._TO_DICT_KEYS, self._TO_DICT_GET(self)))
+        payload["role"] = self.role.value
+        payload["status"] = self.status.value
+        payload["created_at"] = self.created_at.isoformat()
+        payload["updated_at"] = self.updated_at.isoformat()
+        payload["last_login"] = self.last_login.isoformat() if self.last_login else None
+        payload["permissions"] = sorted(self.permissions)
+        return payload
     
     def __eq__(self, other: object) -> bool:
-        if not isinstance(other, User):
-            return False
-        return self.id == other.id
+        return isinstance(other, User) and self._id_hash == other._id_hash and self.id == other.id
     
     def __hash__(self) -> int:
-        return hash(self.id)
\ No newline at end of file
+        return self._id_hash
\ No newline at end of file
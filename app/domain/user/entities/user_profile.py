@@ -2,13 +2,16 @@
 User Profile Entity
 Part of User Aggregate
 """
+import operator
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional, Dict, Any
-import uuid
 
+from app.domain.user.clock import utc_now
+from app.domain.user.ids import new_id
 
-@dataclass
+
+@dataclass(slots=True)
 class UserProfile:
     """
     User Profile Entity
@@ -24,14 +27,14 @@ class UserProfile:
     job_title: Optional[str] = None
     skills: list = field(default_factory=list)
     preferences: Dict[str, Any] = field(default_factory=dict)
-    created_at: datetime = field(default_factory=datetime.utcnow)
-    updated_at: datetime = field(default_factory=datetime.utcnow)
+    created_at: datetime = field(default_factory=utc_now)
+    updated_at: datetime = field(default_factory=utc_now)
     
     @classmethod
     def create_for_user(cls, user_id: str) -> "UserProfile":
         """Create default profile for new user"""
         return cls(
-            id=str(uuid.uuid4()),
+            id=new_id(),
             user_id=user_id,
             preferences={
                 "theme": "light",
@@ -86,19 +89,16 @@ class UserProfile:
         """Get specific preference value"""
         return self.preferences.get(key, default)
     
+    # Attributes read by to_dict in a single attrgetter call
+    _TO_DICT_KEYS = (
+        "id", "user_id", "avatar_url", "bio", "location", "website", "company",
+        "job_title", "skills", "preferences", "created_at", "updated_at"
+    )
+    _TO_DICT_GET = operator.attrgetter(*_TO_DICT_KEYS)
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
-        return {
-            "id": self.id,
-            "user_id": self.user_id,
-            "avatar_url": self.avatar_url,
-            "bio": self.bio,
-            "location": self.location,
-            "website": self.website,
-            "company": self.company,
-            "job_title": self.job_title,
-            "skills": self.skills,
-            "preferences": self.preferences,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat()
-        }
+        payload = dict(zip(self._TO_DICT_KEYS, self._TO_DICT_GET(self)))
+        payload["created_at"] = self.created_at.isoformat()
+        payload["updated_at"] = self.updated_at.isoformat()
+        return payload
@@ -0,0 +1,31 @@
+"""
+Identifier generation for the User aggregate
+"""
+import os
+import time
+import uuid
+
+# Python 3.14+ ships uuid.uuid7 natively
+_uuid7 = getattr(uuid, "uuid7", None)
+
+
+def new_id() -> str:
+    """
+    Mint a time-ordered UUIDv7 (RFC 9562) in the canonical 36-char form.
+    Leading millisecond timestamp keeps new rows appending to the end of
+    primary key indexes instead of landing at random positions.
+    """
+    if _uuid7 is not None:
+        return str(_uuid7())
+    
+    timestamp_ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), "big")
+    value = (
+        (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80
+        | 0x7 << 76                              # version
+        | ((rand >> 62) & 0xFFF) << 64           # rand_a
+        | 0b10 << 62                             # variant
+        | (rand & 0x3FFF_FFFF_FFFF_FFFF)         # rand_b
+    )
+    h = f"{value:032x}"
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
@@ -3,10 +3,17 @@ User Entity Repository Interface (Legacy)
 For backward compatibility with existing code
 """
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from typing import AsyncIterator, Optional, List, TypeVar
 from .entities.user import User
 from .value_objects.email import Email
 
+T = TypeVar("T")
+
+
+async def collect(iterator: AsyncIterator[T]) -> List[T]:
+    """Drain a streaming repository result into a list"""
+    return [item async for item in iterator]
+
 
 class UserEntityRepository(ABC):
     """
@@ -42,13 +49,16 @@ class UserEntityRepository(ABC):
         pass
     
     @abstractmethod
-    async def list_all(
+    def list_all(
         self, 
         limit: int = 100, 
         offset: int = 0,
         filters: Optional[dict] = None
-    ) -> List[User]:
-        """List all users with pagination and filters"""
+    ) -> AsyncIterator[User]:
+        """
+        Stream all users with pagination and filters
+        Implemented as an async generator; use collect() when a list is required
+        """
         pass
     
     @abstractmethod
@@ -67,17 +77,17 @@ class UserEntityRepository(ABC):
         pass
     
     @abstractmethod
-    async def find_by_role(self, role: str) -> List[User]:
-        """Find all users with specific role"""
+    def find_by_role(self, role: str) -> AsyncIterator[User]:
+        """Stream all users with specific role (async generator)"""
         pass
     
     @abstractmethod
-    async def search(
+    def search(
         self,
         query: str,
         limit: int = 50
-    ) -> List[User]:
-        """Search users by name, email, or username"""
+    ) -> AsyncIterator[User]:
+        """Stream users matching name, email, or username (async generator)"""
         pass
 
 
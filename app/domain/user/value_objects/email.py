@@ -1,8 +1,39 @@
 """
 Email Value Object
 """
-import re
-from dataclasses import dataclass
+import string
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+
+MAX_EMAIL_LENGTH = 255
+
+# Translation tables deleting every allowed character; any leftover means invalid.
+# Together with the checks in is_valid_email this accepts exactly the RFC 5322
+# simplified pattern ^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$
+_LOCAL_STRIP = str.maketrans("", "", string.ascii_letters + string.digits + "._%+-")
+_DOMAIN_STRIP = str.maketrans("", "", string.ascii_letters + string.digits + ".-")
+
+# Free email providers (non-corporate domains)
+_FREE_EMAIL_DOMAINS = frozenset({
+    'gmail.com', 'yahoo.com', 'hotmail.com', 'outlook.com',
+    'protonmail.com', 'icloud.com', 'mail.com', 'aol.com',
+    'yandex.com', 'zoho.com'
+})
+
+
+def is_valid_email(value: str) -> bool:
+    """Validate email format without running a regex"""
+    local, at, domain = value.partition('@')
+    if not at or not local or local.translate(_LOCAL_STRIP) or domain.translate(_DOMAIN_STRIP):
+        return False
+    
+    # Domain needs a non-empty name before its last dot and an alphabetic TLD of 2+ letters
+    dot = domain.rfind('.')
+    if dot < 1:
+        return False
+    tld = domain[dot + 1:]
+    return len(tld) >= 2 and tld.isascii() and tld.isalpha()
 
 
 @dataclass(frozen=True)
@@ -12,6 +43,10 @@ class Email:
     """
     value: str
     
+    # Local and domain parts, split once on creation
+    _username: str = field(init=False, repr=False, compare=False)
+    _domain: str = field(init=False, repr=False, compare=False)
+    
     def __post_init__(self):
         """Validate email on creation"""
         if not self.value:
@@ -23,33 +58,39 @@ class Email:
         if not self._is_valid():
             raise ValueError(f"Invalid email format: {self.value}")
         
-        if len(self.value) > 255:
+        if len(self.value) > MAX_EMAIL_LENGTH:
             raise ValueError("Email cannot be longer than 255 characters")
+        
+        username, _, domain = self.value.partition('@')
+        object.__setattr__(self, '_username', username)
+        object.__setattr__(self, '_domain', domain)
+    
+    @classmethod
+    @lru_cache(maxsize=4096)
+    def get(cls, value: str) -> "Email":
+        """
+        Get a validated Email, reusing the instance for repeated addresses.
+        Invalid values raise ValueError and are not cached.
+        """
+        return cls(value)
     
     def _is_valid(self) -> bool:
         """Validate email format"""
-        # RFC 5322 simplified regex pattern
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return re.match(pattern, self.value) is not None
+        return is_valid_email(self.value)
     
     @property
     def domain(self) -> str:
         """Get email domain"""
-        return self.value.split('@')[1]
+        return self._domain
     
     @property
     def username(self) -> str:
         """Get email username part"""
-        return self.value.split('@')[0]
+        return self._username
     
     def is_corporate_email(self) -> bool:
         """Check if email is from a corporate domain (not free email provider)"""
-        free_domains = {
-            'gmail.com', 'yahoo.com', 'hotmail.com', 'outlook.com',
-            'protonmail.com', 'icloud.com', 'mail.com', 'aol.com',
-            'yandex.com', 'zoho.com'
-        }
-        return self.domain not in free_domains
+        return self.domain not in _FREE_EMAIL_DOMAINS
     
     def __str__(self) -> str:
         return self.value
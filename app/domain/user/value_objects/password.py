@@ -2,16 +2,104 @@
 Password Value Object
 """
 import re
-from dataclasses import dataclass
-from typing import List
+import string
+from dataclasses import dataclass, field
+from typing import FrozenSet, List, Optional
 
+from app.domain.user.value_objects.password_bloom import BloomFilter
 
-@dataclass(frozen=True)
+
+# Character class bits folded by _classify
+_UPPER = 1
+_LOWER = 2
+_DIGIT = 4
+_SPECIAL = 8
+
+# Special characters accepted by the policy; the text form is shown in error messages
+_SPECIAL_CHARS_TEXT = "!@#$%^&*()_+-=[]{}|;:,.<>?"
+_SPECIAL_CHARS = frozenset(_SPECIAL_CHARS_TEXT)
+
+# Maps every ASCII character to its class bit as a control-char sentinel
+# (or deletes it); non-ASCII characters pass through untouched
+_CLASS_TABLE = str.maketrans(
+    {c: None for c in map(chr, range(128))}
+    | dict.fromkeys(string.ascii_uppercase, chr(_UPPER))
+    | dict.fromkeys(string.ascii_lowercase, chr(_LOWER))
+    | dict.fromkeys(string.digits, chr(_DIGIT))
+    | dict.fromkeys(_SPECIAL_CHARS, chr(_SPECIAL))
+)
+
+# Common weak passwords, rejected as exact values or as substrings
+_COMMON_WEAK = frozenset({
+    'password', 'qwerty', 'admin', 'letmein', 'welcome',
+    'monkey', 'dragon', 'master', 'superman'
+})
+
+# Repeated characters (3+), sequential digits, sequential letters or a common weak password
+_WEAK_PATTERN = re.compile(
+    r'(.)\1{2,}'
+    r'|012|123|234|345|456|567|678|789|890'
+    r'|abc|bcd|cde|def|efg|fgh|ghi|hij|ijk|jkl|klm|lmn|mno|nop|opq|pqr|qrs|rst|stu|tuv|uvw|vwx|wxy|xyz'
+    '|' + '|'.join(sorted(_COMMON_WEAK))
+)
+
+# Optional filter of breached passwords and the exact lower-cased top-N list that
+# confirms its hits, installed at startup by use_breached_passwords
+_breached_passwords: Optional[BloomFilter] = None
+_breached_top: Optional[FrozenSet[str]] = None
+
+
+def use_breached_passwords(bloom: Optional[BloomFilter],
+                           top_passwords: Optional[FrozenSet[str]] = None) -> None:
+    """
+    Reject passwords found in bloom (None disables the check). A bloom hit is
+    confirmed against the exact lower-cased top_passwords when given, so the
+    filter's false positives are not rejected as breached.
+    """
+    global _breached_passwords, _breached_top
+    _breached_passwords = bloom
+    _breached_top = top_passwords
+
+
+def _is_breached(value: str) -> bool:
+    """Check the bloom filter first; only its hits reach the exact set"""
+    if _breached_passwords is None or value not in _breached_passwords:
+        return False
+    return _breached_top is None or value.lower() in _breached_top
+
+
+def _classify(chars: str) -> int:
+    """Get the bitmask of character classes present in chars, in one C-level pass"""
+    classes = set(chars.translate(_CLASS_TABLE))
+    if chars.isascii():
+        # Only distinct single-bit sentinels remain, so their sum is the mask
+        return sum(map(ord, classes))
+    
+    mask = 0
+    for c in classes:
+        if c < "\x80":
+            mask |= ord(c)
+        elif c.isupper():
+            mask |= _UPPER
+        elif c.islower():
+            mask |= _LOWER
+        elif c.isdigit():
+            mask |= _DIGIT
+    return mask
+
+
+@dataclass(frozen=True, slots=True)
 class Password:
     """
     Password value object - immutable and self-validating
     """
     value: str
+    # Character classes present in value, computed once by _classify_chars
+    _class_mask: int = field(default=0, init=False, repr=False, compare=False)
+    # Number of distinct characters in value, for the entropy bonus
+    _unique_count: int = field(default=0, init=False, repr=False, compare=False)
+    # Result of calculate_strength, computed once after validation
+    _strength: str = field(default="", init=False, repr=False, compare=False)
     
     # Password requirements
     MIN_LENGTH = 8
@@ -20,16 +108,46 @@ class Password:
     REQUIRE_LOWERCASE = True
     REQUIRE_DIGIT = True
     REQUIRE_SPECIAL = True
-    SPECIAL_CHARS = "!@#$%^&*()_+-=[]{}|;:,.<>?"
+    SPECIAL_CHARS = _SPECIAL_CHARS_TEXT
     
     def __post_init__(self):
         """Validate password on creation"""
         if not self.value:
             raise ValueError("Password cannot be empty")
         
-        errors = self._validate()
-        if errors:
-            raise ValueError(f"Password validation failed: {'; '.join(errors)}")
+        # Only collect the full error list once the fast check has failed
+        if not self._is_valid():
+            raise ValueError(f"Password validation failed: {'; '.join(self._validate())}")
+        
+        object.__setattr__(self, "_strength", self._compute_strength())
+    
+    def _classify_chars(self) -> int:
+        """Compute the class mask and unique count on first use"""
+        if not self._unique_count:
+            # Classify the distinct characters only; the same set gives the unique count
+            unique_chars = "".join(set(self.value))
+            object.__setattr__(self, "_class_mask", _classify(unique_chars))
+            object.__setattr__(self, "_unique_count", len(unique_chars))
+        return self._class_mask
+    
+    def _is_valid(self) -> bool:
+        """Check security requirements cheapest-first, stopping at the first failure"""
+        if not self.MIN_LENGTH <= len(self.value) <= self.MAX_LENGTH:
+            return False
+        
+        required = (
+            (_UPPER if self.REQUIRE_UPPERCASE else 0)
+            | (_LOWER if self.REQUIRE_LOWERCASE else 0)
+            | (_DIGIT if self.REQUIRE_DIGIT else 0)
+            | (_SPECIAL if self.REQUIRE_SPECIAL else 0)
+        )
+        if self._classify_chars() & required != required:
+            return False
+        
+        if self._has_weak_patterns():
+            return False
+        
+        return not _is_breached(self.value)
     
     def _validate(self) -> List[str]:
         """
@@ -46,77 +164,57 @@ class Password:
             errors.append(f"Cannot be longer than {self.MAX_LENGTH} characters")
         
         # Check character requirements
-        if self.REQUIRE_UPPERCASE and not any(c.isupper() for c in self.value):
+        mask = self._classify_chars()
+        if self.REQUIRE_UPPERCASE and not mask & _UPPER:
             errors.append("Must contain at least one uppercase letter")
         
-        if self.REQUIRE_LOWERCASE and not any(c.islower() for c in self.value):
+        if self.REQUIRE_LOWERCASE and not mask & _LOWER:
             errors.append("Must contain at least one lowercase letter")
         
-        if self.REQUIRE_DIGIT and not any(c.isdigit() for c in self.value):
+        if self.REQUIRE_DIGIT and not mask & _DIGIT:
             errors.append("Must contain at least one digit")
         
-        if self.REQUIRE_SPECIAL and not any(c in self.SPECIAL_CHARS for c in self.value):
+        if self.REQUIRE_SPECIAL and not mask & _SPECIAL:
             errors.append(f"Must contain at least one special character ({self.SPECIAL_CHARS})")
         
         # Check for common weak patterns
         if self._has_weak_patterns():
             errors.append("Password contains weak patterns")
         
+        # Check against known breached passwords; without the exact list a hit
+        # may be one of the bloom filter's false positives
+        if _is_breached(self.value):
+            errors.append(
+                "Password has appeared in a data breach" if _breached_top is not None
+                else "Password may have appeared in a data breach"
+            )
+        
         return errors
     
     def _has_weak_patterns(self) -> bool:
         """Check for common weak password patterns"""
-        weak_patterns = [
-            r'(.)\1{2,}',  # Same character repeated 3+ times
-            r'(012|123|234|345|456|567|678|789|890)',  # Sequential numbers
-            r'(abc|bcd|cde|def|efg|fgh|ghi|hij|ijk|jkl|klm|lmn|mno|nop|opq|pqr|qrs|rst|stu|tuv|uvw|vwx|wxy|xyz)',  # Sequential letters
-        ]
-        
         lower_value = self.value.lower()
-        for pattern in weak_patterns:
-            if re.search(pattern, lower_value):
-                return True
-        
-        # Check for common weak passwords
-        common_weak = [
-            'password', 'qwerty', 'admin', 'letmein', 'welcome',
-            'monkey', 'dragon', 'master', 'superman'
-        ]
-        
-        for weak in common_weak:
-            if weak in lower_value:
-                return True
-        
-        return False
+        return lower_value in _COMMON_WEAK or _WEAK_PATTERN.search(lower_value) is not None
     
     def calculate_strength(self) -> str:
         """
-        Calculate password strength
+        Get password strength
         Returns: 'weak', 'medium', 'strong', or 'very_strong'
         """
-        score = 0
+        return self._strength
+    
+    def _compute_strength(self) -> str:
+        """Score length, character diversity and entropy"""
+        length = len(self.value)
         
         # Length scoring
-        if len(self.value) >= 8:
-            score += 1
-        if len(self.value) >= 12:
-            score += 1
-        if len(self.value) >= 16:
-            score += 1
+        score = (length >= 8) + (length >= 12) + (length >= 16)
         
-        # Character diversity scoring
-        if any(c.isupper() for c in self.value):
-            score += 1
-        if any(c.islower() for c in self.value):
-            score += 1
-        if any(c.isdigit() for c in self.value):
-            score += 1
-        if any(c in self.SPECIAL_CHARS for c in self.value):
-            score += 1
+        # Character diversity scoring, one point per class present
+        score += bin(self._class_mask).count("1")
         
         # Entropy bonus
-        unique_chars = len(set(self.value))
-        if unique_chars >= len(self.value) * 0.7:
+        if self._unique_count >= length * 0.7:
             score += 1
         
         # Map score to strength
@@ -0,0 +1,85 @@
+"""
+Password Bloom Filter
+Compact membership test for large breached-password wordlists
+"""
+import hashlib
+import math
+import mmap
+import struct
+from pathlib import Path
+from typing import FrozenSet, Iterable, Union
+
+
+# File layout: magic, hash count (uint32), bit count (uint64), then the bit array
+_MAGIC = b"IRBF"
+_HEADER = struct.Struct("<4sIQ")
+
+
+class BloomFilter:
+    """
+    Bloom filter over lower-cased passwords.
+    Never gives false negatives; false positives occur at the configured rate.
+    """
+
+    __slots__ = ("_bits", "_bit_count", "_hash_count", "_offset")
+
+    def __init__(self, bits: Union[bytearray, mmap.mmap], bit_count: int, hash_count: int,
+                 offset: int = 0) -> None:
+        self._bits = bits
+        self._bit_count = bit_count
+        self._hash_count = hash_count
+        self._offset = offset
+
+    @classmethod
+    def create(cls, capacity: int, false_positive_rate: float = 0.01) -> "BloomFilter":
+        """Create an empty filter sized for capacity entries"""
+        capacity = max(capacity, 1)
+        bit_count = math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2)
+        hash_count = max(round(bit_count / capacity * math.log(2)), 1)
+        return cls(bytearray((bit_count + 7) // 8), bit_count, hash_count)
+
+    @classmethod
+    def build(cls, words: Iterable[str], false_positive_rate: float = 0.01) -> "BloomFilter":
+        """Create a filter containing every word"""
+        words = list(words)
+        bloom = cls.create(len(words), false_positive_rate)
+        for word in words:
+            bloom.add(word)
+        return bloom
+
+    @classmethod
+    def open(cls, path: Union[str, Path]) -> "BloomFilter":
+        """Memory-map a filter written by save(); pages load on demand"""
+        with open(path, "rb") as file:
+            bits = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, hash_count, bit_count = _HEADER.unpack_from(bits)
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is not a password bloom filter")
+        return cls(bits, bit_count, hash_count, offset=_HEADER.size)
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Write the filter in the format read by open()"""
+        with open(path, "wb") as file:
+            file.write(_HEADER.pack(_MAGIC, self._hash_count, self._bit_count))
+            file.write(self._bits[self._offset:])
+
+    def _positions(self, word: str) -> Iterable[int]:
+        # Double hashing: k positions from the two halves of one blake2b digest
+        digest = hashlib.blake2b(word.lower().encode("utf-8"), digest_size=16).digest()
+        h1, h2 = struct.unpack("<QQ", digest)
+        return ((h1 + i * h2) % self._bit_count for i in range(self._hash_count))
+
+    def add(self, word: str) -> None:
+        """Add a word to the filter"""
+        for position in self._positions(word):
+            self._bits[self._offset + (position >> 3)] |= 1 << (position & 7)
+
+    def __contains__(self, word: str) -> bool:
+        bits, offset = self._bits, self._offset
+        return all(bits[offset + (position >> 3)] & (1 << (position & 7)) for position in self._positions(word))
+
+
+def load_top_passwords(path: Union[str, Path]) -> FrozenSet[str]:
+    """Read a wordlist, one password per line, as the lower-cased set that confirms bloom hits"""
+    with open(path, encoding="utf-8") as file:
+        return frozenset(line.rstrip("\r\n").lower() for line in file if line.strip())
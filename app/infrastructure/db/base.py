@@ -1,10 +1,21 @@
 """
 SQLAlchemy Base Configuration
 """
+import asyncio
+
+import orjson
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 
 from app.core.config import settings
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def json_serializer(value) -> str:
+    """Serialize JSON columns with orjson; non-string keys are accepted as the stdlib does"""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
 
 
 class Base(DeclarativeBase):
@@ -15,6 +26,13 @@ class Base(DeclarativeBase):
 # Create async engine with conditional parameters
 engine_kwargs = {
     "echo": settings.database_echo,
+    # Rows per multi-row INSERT when executing batched inserts/upserts (save_many)
+    "insertmanyvalues_page_size": 1000,
+    # Room for every distinct repository statement without compiled-SQL cache evictions
+    "query_cache_size": 1200,
+    # JSON columns (metadata, preferences, conditions) go through orjson instead of stdlib json
+    "json_serializer": json_serializer,
+    "json_deserializer": orjson.loads,
 }
 
 # Add PostgreSQL-specific parameters only for PostgreSQL
@@ -23,7 +41,13 @@ if "postgresql" in settings.database_url:
         "pool_size": settings.database_pool_size,
         "max_overflow": settings.database_max_overflow,
         "pool_pre_ping": settings.database_pool_pre_ping,
+        "pool_recycle": settings.database_pool_recycle,
+        # Reuse the most recently returned connection, which has the warmest server-side caches
+        "pool_use_lifo": True,
     })
+    if "asyncpg" in settings.database_url:
+        # Cache prepared statements per connection so repeated queries skip parse/plan
+        engine_kwargs["connect_args"] = {"prepared_statement_cache_size": 500}
 
 engine = create_async_engine(
     settings.database_url,
@@ -52,6 +76,45 @@ async def init_db():
         
         # Create all tables
         await conn.run_sync(Base.metadata.create_all)
+        await create_indexes(conn)
+    
+    await warm_up_pool()
+
+
+async def create_indexes(conn) -> None:
+    """Create the PostgreSQL-only indexes from indexes.py on an open connection"""
+    if conn.dialect.name != "postgresql":
+        return
+    
+    from app.infrastructure.db.indexes import postgres_indexes
+    
+    for index in postgres_indexes():
+        await conn.run_sync(index.create, checkfirst=True)
+
+
+async def warm_up_pool():
+    """
+    Open pool_size connections up front so first requests don't pay connect latency.
+    Best-effort: failures are logged, every connection that did open is returned
+    to the pool, and startup carries on.
+    """
+    if "postgresql" not in settings.database_url:
+        return
+    
+    # Hold all connections at once; opening them one by one would reuse the same one
+    results = await asyncio.gather(
+        *(engine.connect() for _ in range(settings.database_pool_size)),
+        return_exceptions=True,
+    )
+    failures = [result for result in results if isinstance(result, BaseException)]
+    for result in results:
+        if not isinstance(result, BaseException):
+            await result.close()
+    if failures:
+        logger.warning(
+            f"Connection pool warm-up opened {len(results) - len(failures)}/{len(results)} "
+            f"connections: {failures[0]}"
+        )
 
 
 async def close_db():
@@ -0,0 +1,44 @@
+"""
+PostgreSQL Indexes
+Created by init_db after the tables for queries the model definitions don't index;
+other dialects skip them
+"""
+from functools import lru_cache
+from typing import Tuple
+
+from sqlalchemy import Index, func, text, true
+
+# Text search configuration; 'simple' does no stemming, so it works for Vietnamese too
+TS_CONFIG = text("'simple'")
+
+
+def ts_vector(column):
+    """to_tsvector expression matching the GIN indexes below"""
+    return func.to_tsvector(TS_CONFIG, column)
+
+
+@lru_cache(maxsize=None)
+def postgres_indexes() -> Tuple[Index, ...]:
+    """Indexes created on PostgreSQL (built once, they attach to their tables)"""
+    from app.infrastructure.db.models.chat import ChatSession, ChatMessage
+    from app.infrastructure.db.models.user import User
+
+    sessions = ChatSession.__table__.c
+    messages = ChatMessage.__table__.c
+    users = User.__table__.c
+    return (
+        # Active sessions of a user, newest first (listing, counts, search, statistics)
+        Index(
+            "ix_chat_sessions_user_active_updated",
+            sessions.user_id, sessions.updated_at,
+            postgresql_where=sessions.is_active == true(),
+        ),
+        # Messages of a session in created_at order, without a sort step
+        Index("ix_chat_messages_session_created", messages.session_id, messages.created_at),
+        # Full-text search over session titles and message content (search_sessions)
+        Index("ix_chat_sessions_title_fts", ts_vector(sessions.title), postgresql_using="gin"),
+        Index("ix_chat_messages_content_fts", ts_vector(messages.content), postgresql_using="gin"),
+        # Email lookups answered from the index alone (exists_by_email); emails are
+        # stored lower-cased, so no lower(email) expression index is needed
+        Index("ix_users_email_covering", users.email, postgresql_include=["id"]),
+    )
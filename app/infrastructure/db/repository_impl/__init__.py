@@ -1,13 +1,17 @@
 from .user_repository_impl import InMemoryUserRepository
 from .sqlalchemy_user_repository import SQLAlchemyUserRepository
-from .sqlalchemy_user_aggregate_repository import SQLAlchemyUserAggregateRepository
+from .sqlalchemy_user_aggregate_repository import SQLAlchemyUserAggregateRepository, fetch_user_aggregate
 from .document_repository_impl import SQLAlchemyDocumentRepository
 from .embedding_repository_impl import SQLAlchemyEmbeddingRepository
+from .document_bundle import DocumentBundle, fetch_document_bundle
 
 __all__ = [
     "InMemoryUserRepository", 
     "SQLAlchemyUserRepository",
     "SQLAlchemyUserAggregateRepository",
     "SQLAlchemyDocumentRepository",
-    "SQLAlchemyEmbeddingRepository"
+    "SQLAlchemyEmbeddingRepository",
+    "DocumentBundle",
+    "fetch_document_bundle",
+    "fetch_user_aggregate"
 ]
@@ -0,0 +1,35 @@
+"""
+Document Bundle Loading
+Loads a document together with its chunks and their embeddings
+"""
+import uuid
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.document.entities import Document, DocumentChunk
+from app.domain.embedding.entities import Embedding
+from app.infrastructure.db.session import gather_on_sessions
+from .document_repository_impl import SQLAlchemyDocumentRepository
+from .embedding_repository_impl import SQLAlchemyEmbeddingRepository
+
+
+@dataclass
+class DocumentBundle:
+    """A document with its chunks and their embeddings"""
+    document: Optional[Document]
+    chunks: List[DocumentChunk] = field(default_factory=list)
+    embeddings: List[Embedding] = field(default_factory=list)
+
+
+async def fetch_document_bundle(session_factory: Callable[[], AsyncSession],
+                                document_id: uuid.UUID) -> DocumentBundle:
+    """Run the document, chunk and embedding lookups concurrently (see gather_on_sessions)"""
+    document, chunks, embeddings = await gather_on_sessions(
+        session_factory,
+        lambda session: SQLAlchemyDocumentRepository(session).find_by_id(document_id),
+        lambda session: SQLAlchemyDocumentRepository(session).find_chunks_by_document_id(document_id),
+        lambda session: SQLAlchemyEmbeddingRepository(session).find_by_document_id(document_id),
+    )
+    return DocumentBundle(document=document, chunks=chunks, embeddings=embeddings)
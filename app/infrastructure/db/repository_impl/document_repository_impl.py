@@ -1,9 +1,11 @@
 """
 Document Repository Implementation with SQLAlchemy
 """
-from typing import List, Optional, Dict, Any
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import AsyncIterator, List, Optional, Dict, Any
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete
+from sqlalchemy import select, update, delete, bindparam
 from sqlalchemy.orm import selectinload
 import uuid
 
@@ -11,163 +13,253 @@ from app.domain.document.repository import DocumentRepository
 from app.domain.document.entities import Document, DocumentStatus, DocumentType
 from app.domain.document.entities import DocumentChunk, ChunkStatus
 from app.infrastructure.db.models.document import Document as DocumentModel, DocumentChunk as DocumentChunkModel
+from app.infrastructure.db.upsert import reject_duplicate_keys, upsert
+
+
+# Rows fetched per round-trip when streaming chunks
+STREAM_BATCH_SIZE = 500
+
+# Columns an upsert only writes on insert
+_DOCUMENT_KEEP = ("id", "user_id", "created_at")
+_CHUNK_KEEP = ("id", "document_id", "created_at")
+
+# Stored value -> enum member; a dict hit is much cheaper than Enum.__call__ per row
+_DOCUMENT_STATUSES = {status.value: status for status in DocumentStatus}
+_DOCUMENT_TYPES = {document_type.value: document_type for document_type in DocumentType}
+_CHUNK_STATUSES = {status.value: status for status in ChunkStatus}
+
+# Column name and domain getter pairs, resolved once at import
+_DOCUMENT_COLUMNS = (
+    ("id", attrgetter("id")),
+    ("user_id", attrgetter("user_id")),
+    ("title", attrgetter("title")),
+    ("content", attrgetter("content")),
+    ("file_path", attrgetter("file_path")),
+    ("file_size", attrgetter("file_size")),
+    ("file_type", attrgetter("file_type.value")),
+    ("status", attrgetter("status.value")),
+    ("document_type", attrgetter("document_type.value")),
+    ("created_at", attrgetter("created_at")),
+    ("updated_at", attrgetter("updated_at")),
+    ("document_metadata", attrgetter("metadata")),
+    ("processing_config", attrgetter("processing_config")),
+    ("version", attrgetter("version")),
+)
+
+_CHUNK_COLUMNS = (
+    ("id", attrgetter("id")),
+    ("document_id", attrgetter("document_id")),
+    ("content", attrgetter("content")),
+    ("chunk_index", attrgetter("chunk_index")),
+    ("start_position", attrgetter("start_position")),
+    ("end_position", attrgetter("end_position")),
+    ("status", attrgetter("status.value")),
+    ("created_at", attrgetter("created_at")),
+    ("updated_at", attrgetter("updated_at")),
+    ("embedding", attrgetter("embedding")),
+    ("chunk_metadata", attrgetter("metadata")),
+    ("tokens_used", attrgetter("tokens_used")),
+    ("embedding_model", attrgetter("embedding_model")),
+)
+
+_DOCUMENT_COLUMN_NAMES = tuple(name for name, _ in _DOCUMENT_COLUMNS)
+_CHUNK_COLUMN_NAMES = tuple(name for name, _ in _CHUNK_COLUMNS)
+
+# Statements built once at import and executed with bound parameters, so
+# hot calls skip statement construction and cache-key generation
+_UPSERT_DOCUMENT = upsert(DocumentModel, _DOCUMENT_COLUMN_NAMES, keep=_DOCUMENT_KEEP)
+_UPSERT_CHUNK = upsert(DocumentChunkModel, _CHUNK_COLUMN_NAMES, keep=_CHUNK_KEEP)
+_FIND_DOCUMENT_BY_ID = select(DocumentModel).where(DocumentModel.id == bindparam("id"))
+_FIND_DOCUMENT_WITH_CHUNKS_BY_ID = _FIND_DOCUMENT_BY_ID.options(selectinload(DocumentModel.chunks))
+_FIND_DOCUMENTS_BY_IDS = select(DocumentModel).where(DocumentModel.id.in_(bindparam("ids", expanding=True)))
+_FIND_DOCUMENTS_WITH_CHUNKS_BY_IDS = _FIND_DOCUMENTS_BY_IDS.options(selectinload(DocumentModel.chunks))
+_FIND_DOCUMENTS_BY_STATUS = select(DocumentModel).where(DocumentModel.status == bindparam("status"))
+_FIND_DOCUMENT_IDS_BY_STATUS = select(DocumentModel.id).where(DocumentModel.status == bindparam("status"))
+_FIND_DOCUMENT_SUMMARIES_BY_STATUS = select(DocumentModel.id, DocumentModel.title).where(
+    DocumentModel.status == bindparam("status")
+)
+_DELETE_DOCUMENT = delete(DocumentModel).where(DocumentModel.id == bindparam("id")).returning(DocumentModel.id)
+_DELETE_DOCUMENTS = delete(DocumentModel).where(
+    DocumentModel.id.in_(bindparam("ids", expanding=True))
+).returning(DocumentModel.id)
+_FIND_CHUNKS_BY_DOCUMENT_ID = select(DocumentChunkModel).where(
+    DocumentChunkModel.document_id == bindparam("document_id")
+)
+_FIND_CHUNKS_IN_ORDER = _FIND_CHUNKS_BY_DOCUMENT_ID.order_by(DocumentChunkModel.chunk_index)
+
+
+def _update_mapping(row: Dict[str, Any], keep) -> Dict[str, Any]:
+    """Column mapping for a bulk UPDATE by primary key: the id plus every updatable column"""
+    return {name: value for name, value in row.items() if name == "id" or name not in keep}
+
+
+@dataclass(frozen=True, slots=True)
+class DocumentSummary:
+    """Listing projection of a document, without content or metadata"""
+    id: uuid.UUID
+    title: str
+    status: DocumentStatus
 
 
 class SQLAlchemyDocumentRepository(DocumentRepository):
-    """SQLAlchemy implementation of DocumentRepository"""
+    """
+    SQLAlchemy implementation of DocumentRepository, for PostgreSQL only:
+    saves are INSERT ... ON CONFLICT DO UPDATE upserts (see db/upsert.py).
+    Writes are not committed here and database errors propagate unchanged;
+    whoever owns the session commits once per unit of work or rolls back
+    (see wiring.get_db_session).
+    """
     
     def __init__(self, session: AsyncSession):
         self.session = session
     
     async def save(self, document: Document) -> Document:
         """Save document to database"""
-        try:
-            # Check if document exists
-            stmt = select(DocumentModel).where(DocumentModel.id == document.id)
-            result = await self.session.execute(stmt)
-            existing_doc = result.scalar_one_or_none()
-            
-            if existing_doc:
-                # Update existing document
-                await self._update_document_model(existing_doc, document)
-                await self.session.commit()
-                return await self._model_to_document(existing_doc)
-            else:
-                # Create new document
-                doc_model = self._document_to_model(document)
-                self.session.add(doc_model)
-                await self.session.commit()
-                await self.session.refresh(doc_model)
-                return await self._model_to_document(doc_model)
-                
-        except Exception as e:
-            await self.session.rollback()
-            raise Exception(f"Error saving document: {str(e)}")
-    
-    async def find_by_id(self, document_id: uuid.UUID) -> Optional[Document]:
-        """Find document by ID"""
-        try:
-            stmt = select(DocumentModel).where(DocumentModel.id == document_id)
-            result = await self.session.execute(stmt)
-            doc_model = result.scalar_one_or_none()
-            
-            if doc_model:
-                return await self._model_to_document(doc_model)
-            return None
-            
-        except Exception as e:
-            raise Exception(f"Error finding document: {str(e)}")
-    
-    async def find_by_user_id(self, user_id: uuid.UUID) -> List[Document]:
-        """Find documents by user ID"""
-        try:
-            stmt = select(DocumentModel).where(DocumentModel.user_id == user_id)
-            result = await self.session.execute(stmt)
-            doc_models = result.scalars().all()
-            
-            return [await self._model_to_document(doc) for doc in doc_models]
-            
-        except Exception as e:
-            raise Exception(f"Error finding documents by user: {str(e)}")
+        values = self._document_to_dict(document)
+        doc_model = (await self.session.execute(_UPSERT_DOCUMENT, [values])).scalar_one()
+        return self._model_to_document(doc_model)
+    
+    async def save_many(self, documents: List[Document]) -> List[Document]:
+        """Save documents with one batched upsert; results follow the order of documents"""
+        if not documents:
+            return []
+        rows = [self._document_to_dict(document) for document in documents]
+        reject_duplicate_keys(rows)
+        doc_models = (await self.session.execute(_UPSERT_DOCUMENT, rows)).scalars().all()
+        return [self._model_to_document(doc) for doc in doc_models]
+    
+    async def update_many(self, documents: List[Document]) -> None:
+        """Update existing documents with one bulk UPDATE by primary key"""
+        if not documents:
+            return
+        mappings = [_update_mapping(self._document_to_dict(document), _DOCUMENT_KEEP) for document in documents]
+        await self.session.execute(update(DocumentModel), mappings)
+    
+    async def find_by_id(self, document_id: uuid.UUID, *, with_chunks: bool = False) -> Optional[Document]:
+        """Find document by ID, optionally loading its chunks in the same call"""
+        stmt = _FIND_DOCUMENT_WITH_CHUNKS_BY_ID if with_chunks else _FIND_DOCUMENT_BY_ID
+        result = await self.session.execute(stmt, {"id": document_id})
+        doc_model = result.scalar_one_or_none()
+        
+        if doc_model:
+            return self._model_to_document(doc_model, with_chunks)
+        return None
+    
+    async def find_many_by_ids(self, document_ids: List[uuid.UUID], *,
+                               with_chunks: bool = False) -> List[Document]:
+        """Find documents by IDs (one query, plus one for all their chunks)"""
+        if not document_ids:
+            return []
+        stmt = _FIND_DOCUMENTS_WITH_CHUNKS_BY_IDS if with_chunks else _FIND_DOCUMENTS_BY_IDS
+        result = await self.session.execute(stmt, {"ids": document_ids})
+        doc_models = result.scalars().all()
+        
+        return [self._model_to_document(doc, with_chunks) for doc in doc_models]
+    
+    async def find_by_user_id(self, user_id: uuid.UUID, *, limit: Optional[int] = 100,
+                              after_id: Optional[uuid.UUID] = None) -> List[Document]:
+        """Find a page of documents by user ID, ordered by ID"""
+        stmt = select(DocumentModel).where(DocumentModel.user_id == user_id)
+        # Keyset pagination: continue after the last ID of the previous page
+        if after_id is not None:
+            stmt = stmt.where(DocumentModel.id > after_id)
+        stmt = stmt.order_by(DocumentModel.id)
+        if limit:
+            stmt = stmt.limit(limit)
+        result = await self.session.execute(stmt)
+        doc_models = result.scalars().all()
+        
+        return [self._model_to_document(doc) for doc in doc_models]
     
     async def find_by_status(self, status: DocumentStatus) -> List[Document]:
         """Find documents by status"""
-        try:
-            stmt = select(DocumentModel).where(DocumentModel.status == status.value)
-            result = await self.session.execute(stmt)
-            doc_models = result.scalars().all()
-            
-            return [await self._model_to_document(doc) for doc in doc_models]
-            
-        except Exception as e:
-            raise Exception(f"Error finding documents by status: {str(e)}")
+        result = await self.session.execute(_FIND_DOCUMENTS_BY_STATUS, {"status": status.value})
+        doc_models = result.scalars().all()
+        
+        return [self._model_to_document(doc) for doc in doc_models]
+    
+    async def find_ids_by_status(self, status: DocumentStatus) -> List[uuid.UUID]:
+        """Find IDs of documents by status, without loading the rows"""
+        result = await self.session.execute(_FIND_DOCUMENT_IDS_BY_STATUS, {"status": status.value})
+        
+        return list(result.scalars())
+    
+    async def find_summaries_by_status(self, status: DocumentStatus) -> List[DocumentSummary]:
+        """Find id/title/status of documents by status, skipping content and metadata"""
+        result = await self.session.execute(_FIND_DOCUMENT_SUMMARIES_BY_STATUS, {"status": status.value})
+        
+        return [DocumentSummary(id=row.id, title=row.title, status=status) for row in result]
     
     async def delete(self, document_id: uuid.UUID) -> bool:
         """Delete document by ID"""
-        try:
-            stmt = delete(DocumentModel).where(DocumentModel.id == document_id)
-            result = await self.session.execute(stmt)
-            await self.session.commit()
-            
-            return result.rowcount > 0
-            
-        except Exception as e:
-            await self.session.rollback()
-            raise Exception(f"Error deleting document: {str(e)}")
+        deleted_id = (await self.session.execute(_DELETE_DOCUMENT, {"id": document_id})).scalar_one_or_none()
+        
+        return deleted_id is not None
+    
+    async def delete_many(self, document_ids: List[uuid.UUID]) -> int:
+        """Delete documents by IDs in one statement; returns how many existed"""
+        if not document_ids:
+            return 0
+        deleted_ids = (await self.session.execute(_DELETE_DOCUMENTS, {"ids": document_ids})).scalars().all()
+        
+        return len(deleted_ids)
     
     async def save_chunk(self, chunk: DocumentChunk) -> DocumentChunk:
         """Save document chunk"""
-        try:
-            # Check if chunk exists
-            stmt = select(DocumentChunkModel).where(DocumentChunkModel.id == chunk.id)
-            result = await self.session.execute(stmt)
-            existing_chunk = result.scalar_one_or_none()
-            
-            if existing_chunk:
-                # Update existing chunk
-                await self._update_chunk_model(existing_chunk, chunk)
-                await self.session.commit()
-                return await self._model_to_chunk(existing_chunk)
-            else:
-                # Create new chunk
-                chunk_model = self._chunk_to_model(chunk)
-                self.session.add(chunk_model)
-                await self.session.commit()
-                await self.session.refresh(chunk_model)
-                return await self._model_to_chunk(chunk_model)
-                
-        except Exception as e:
-            await self.session.rollback()
-            raise Exception(f"Error saving chunk: {str(e)}")
+        values = self._chunk_to_dict(chunk)
+        chunk_model = (await self.session.execute(_UPSERT_CHUNK, [values])).scalar_one()
+        return self._model_to_chunk(chunk_model)
+    
+    async def save_chunks_many(self, chunks: List[DocumentChunk]) -> List[DocumentChunk]:
+        """Save document chunks with one batched upsert; results follow the order of chunks"""
+        if not chunks:
+            return []
+        rows = [self._chunk_to_dict(chunk) for chunk in chunks]
+        reject_duplicate_keys(rows)
+        chunk_models = (await self.session.execute(_UPSERT_CHUNK, rows)).scalars().all()
+        return [self._model_to_chunk(chunk) for chunk in chunk_models]
+    
+    async def update_chunks_many(self, chunks: List[DocumentChunk]) -> None:
+        """Update existing chunks with one bulk UPDATE by primary key"""
+        if not chunks:
+            return
+        mappings = [_update_mapping(self._chunk_to_dict(chunk), _CHUNK_KEEP) for chunk in chunks]
+        await self.session.execute(update(DocumentChunkModel), mappings)
     
     async def find_chunks_by_document_id(self, document_id: uuid.UUID) -> List[DocumentChunk]:
         """Find chunks by document ID"""
-        try:
-            stmt = select(DocumentChunkModel).where(DocumentChunkModel.document_id == document_id)
-            result = await self.session.execute(stmt)
-            chunk_models = result.scalars().all()
-            
-            return [await self._model_to_chunk(chunk) for chunk in chunk_models]
-            
-        except Exception as e:
-            raise Exception(f"Error finding chunks: {str(e)}")
+        result = await self.session.execute(_FIND_CHUNKS_BY_DOCUMENT_ID, {"document_id": document_id})
+        chunk_models = result.scalars().all()
+        
+        return [self._model_to_chunk(chunk) for chunk in chunk_models]
     
-    # Helper methods for conversion
-    def _document_to_model(self, document: Document) -> DocumentModel:
-        """Convert domain Document to SQLAlchemy model"""
-        return DocumentModel(
-            id=document.id,
-            user_id=document.user_id,
-            title=document.title,
-            content=document.content,
-            file_path=document.file_path,
-            file_size=document.file_size,
-            file_type=document.file_type.value,
-            status=document.status.value,
-            document_type=document.document_type.value,
-            created_at=document.created_at,
-            updated_at=document.updated_at,
-            document_metadata=document.metadata,
-            processing_config=document.processing_config,
-            version=document.version
+    async def stream_chunks_by_document_id(self, document_id: uuid.UUID) -> AsyncIterator[DocumentChunk]:
+        """Stream chunks of a document in order, holding one batch in memory at a time"""
+        result = await self.session.stream_scalars(
+            _FIND_CHUNKS_IN_ORDER.execution_options(yield_per=STREAM_BATCH_SIZE),
+            {"document_id": document_id},
+        )
+        async for chunk_model in result:
+            yield self._model_to_chunk(chunk_model)
+    
+    async def stream_chunk_batches(self, document_id: uuid.UUID,
+                                   batch_size: int = STREAM_BATCH_SIZE) -> AsyncIterator[List[DocumentChunk]]:
+        """Stream chunks of a document in order as lists of up to batch_size, one fetch each"""
+        result = await self.session.stream(
+            _FIND_CHUNKS_IN_ORDER.execution_options(yield_per=batch_size),
+            {"document_id": document_id},
         )
+        async for partition in result.scalars().partitions():
+            yield [self._model_to_chunk(chunk_model) for chunk_model in partition]
     
-    async def _update_document_model(self, model: DocumentModel, document: Document):
-        """Update SQLAlchemy model with domain document data"""
-        model.title = document.title
-        model.content = document.content
-        model.file_path = document.file_path
-        model.file_size = document.file_size
-        model.file_type = document.file_type.value
-        model.status = document.status.value
-        model.document_type = document.document_type.value
-        model.updated_at = document.updated_at
-        model.document_metadata = document.metadata
-        model.processing_config = document.processing_config
-        model.version = document.version
-    
-    async def _model_to_document(self, model: DocumentModel) -> Document:
-        """Convert SQLAlchemy model to domain Document"""
+    # Helper methods for conversion
+    def _document_to_dict(self, document: Document) -> Dict[str, Any]:
+        """Convert domain Document to a column mapping"""
+        return {name: get(document) for name, get in _DOCUMENT_COLUMNS}
+    
+    def _model_to_document(self, model: DocumentModel, with_chunks: bool = False) -> Document:
+        """Convert SQLAlchemy model to domain Document (chunks only if eager-loaded)"""
+        chunks = [self._model_to_chunk(chunk) for chunk in model.chunks] if with_chunks else []
         return Document(
             id=model.id,
             user_id=model.user_id,
@@ -175,48 +267,22 @@ class SQLAlchemyDocumentRepository(DocumentRepository):
             content=model.content,
             file_path=model.file_path,
             file_size=model.file_size,
-            file_type=DocumentType(model.file_type),
-            status=DocumentStatus(model.status),
-            document_type=DocumentType(model.document_type),
+            file_type=_DOCUMENT_TYPES[model.file_type],
+            status=_DOCUMENT_STATUSES[model.status],
+            document_type=_DOCUMENT_TYPES[model.document_type],
             created_at=model.created_at,
             updated_at=model.updated_at,
             metadata=model.document_metadata,
             processing_config=model.processing_config,
+            chunks=chunks,
             version=model.version
         )
     
-    def _chunk_to_model(self, chunk: DocumentChunk) -> DocumentChunkModel:
-        """Convert domain DocumentChunk to SQLAlchemy model"""
-        return DocumentChunkModel(
-            id=chunk.id,
-            document_id=chunk.document_id,
-            content=chunk.content,
-            chunk_index=chunk.chunk_index,
-            start_position=chunk.start_position,
-            end_position=chunk.end_position,
-            status=chunk.status.value,
-            created_at=chunk.created_at,
-            updated_at=chunk.updated_at,
-            embedding=chunk.embedding,
-            chunk_metadata=chunk.metadata,
-            tokens_used=chunk.tokens_used,
-            embedding_model=chunk.embedding_model
-        )
+    def _chunk_to_dict(self, chunk: DocumentChunk) -> Dict[str, Any]:
+        """Convert domain DocumentChunk to a column mapping"""
+        return {name: get(chunk) for name, get in _CHUNK_COLUMNS}
     
-    async def _update_chunk_model(self, model: DocumentChunkModel, chunk: DocumentChunk):
-        """Update SQLAlchemy model with domain chunk data"""
-        model.content = chunk.content
-        model.chunk_index = chunk.chunk_index
-        model.start_position = chunk.start_position
-        model.end_position = chunk.end_position
-        model.status = chunk.status.value
-        model.updated_at = chunk.updated_at
-        model.embedding = chunk.embedding
-        model.chunk_metadata = chunk.metadata
-        model.tokens_used = chunk.tokens_used
-        model.embedding_model = chunk.embedding_model
-    
-    async def _model_to_chunk(self, model: DocumentChunkModel) -> DocumentChunk:
+    def _model_to_chunk(self, model: DocumentChunkModel) -> DocumentChunk:
         """Convert SQLAlchemy model to domain DocumentChunk"""
         return DocumentChunk(
             id=model.id,
@@ -225,7 +291,7 @@ class SQLAlchemyDocumentRepository(DocumentRepository):
             chunk_index=model.chunk_index,
             start_position=model.start_position,
             end_position=model.end_position,
-            status=ChunkStatus(model.status),
+            status=_CHUNK_STATUSES[model.status],
             created_at=model.created_at,
             updated_at=model.updated_at,
             embedding=model.embedding,
@@ -1,200 +1,322 @@
 """
 Embedding Repository Implementation with SQLAlchemy
 """
-from typing import List, Optional, Dict, Any
+import copy
+import time
+from operator import attrgetter
+from typing import List, Optional, Dict, Any, Hashable
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete
-from sqlalchemy.orm import selectinload
+from sqlalchemy import event, select, update, delete, bindparam, cast, true, String
+from sqlalchemy.orm import Session, selectinload
 import uuid
 
+import numpy as np
+
 from app.domain.embedding.repository import EmbeddingRepository
 from app.domain.embedding.entities import Embedding, EmbeddingStatus, EmbeddingType
 from app.domain.embedding.entities import EmbeddingModel
 from app.infrastructure.db.models.embedding import Embedding as EmbeddingModel, EmbeddingModel as EmbeddingModelConfig
+from app.infrastructure.db.models.document import DocumentChunk as DocumentChunkModel
+from app.infrastructure.db.upsert import reject_duplicate_keys, upsert
+
+
+# Batches at least this large are loaded with COPY by copy_embeddings
+COPY_THRESHOLD = 100
+
+# Decodes embedding_type like EmbeddingStatus.from_name decodes status: one dict lookup per row
+_EMBEDDING_TYPES = {embedding_type.value: embedding_type for embedding_type in EmbeddingType}
+
+# Column name and domain getter pairs, resolved once at import
+_EMBEDDING_COLUMNS = (
+    ("id", attrgetter("id")),
+    ("vector", attrgetter("vector")),
+    ("embedding_metadata", attrgetter("metadata")),
+    ("embedding_type", attrgetter("embedding_type.value")),
+    ("status", lambda embedding: EmbeddingStatus.name_of(embedding.status)),
+    ("created_at", attrgetter("created_at")),
+    ("updated_at", attrgetter("updated_at")),
+    ("tags", attrgetter("tags")),
+    ("version", attrgetter("version")),
+    ("dimension", attrgetter("dimension")),
+    ("model", attrgetter("model")),
+)
+
+# Statements built once at import and executed with bound parameters, so
+# hot calls skip statement construction and cache-key generation
+_UPSERT_EMBEDDING = upsert(EmbeddingModel, [name for name, _ in _EMBEDDING_COLUMNS])
+_UPSERT_MODEL_CONFIG = upsert(EmbeddingModelConfig, [
+    "id", "name", "config", "created_at", "updated_at", "description", "is_active", "embeddingmodel_metadata",
+])
+_FIND_EMBEDDING_BY_ID = select(EmbeddingModel).where(EmbeddingModel.id == bindparam("id"))
+_FIND_EMBEDDINGS_BY_STATUS = select(EmbeddingModel).where(EmbeddingModel.status == bindparam("status"))
+_FIND_EMBEDDING_IDS_BY_STATUS = select(EmbeddingModel.id).where(EmbeddingModel.status == bindparam("status"))
+_FIND_EMBEDDINGS_BY_TYPE = select(EmbeddingModel).where(EmbeddingModel.embedding_type == bindparam("type"))
+_FIND_EMBEDDINGS_BY_MODEL = select(EmbeddingModel).where(EmbeddingModel.model == bindparam("model"))
+_FIND_EMBEDDING_IDS_BY_MODEL = select(EmbeddingModel.id).where(EmbeddingModel.model == bindparam("model"))
+# Chunk embeddings reference their chunk through metadata.source_id
+_FIND_EMBEDDINGS_BY_DOCUMENT_ID = select(EmbeddingModel).where(
+    EmbeddingModel.embedding_metadata["source_type"].as_string() == "document_chunk",
+    EmbeddingModel.embedding_metadata["source_id"].as_string().in_(
+        select(cast(DocumentChunkModel.id, String)).where(
+            DocumentChunkModel.document_id == bindparam("document_id")
+        )
+    ),
+)
+_DELETE_EMBEDDING = delete(EmbeddingModel).where(EmbeddingModel.id == bindparam("id")).returning(EmbeddingModel.id)
+_DELETE_EMBEDDINGS = delete(EmbeddingModel).where(
+    EmbeddingModel.id.in_(bindparam("ids", expanding=True))
+).returning(EmbeddingModel.id)
+_FIND_MODEL_CONFIG_BY_ID = select(EmbeddingModelConfig).where(EmbeddingModelConfig.id == bindparam("id"))
+_FIND_ACTIVE_MODEL_CONFIGS = select(EmbeddingModelConfig).where(EmbeddingModelConfig.is_active == true())
+
+# Seconds a cached model config stays valid
+CONFIG_CACHE_TTL = 60.0
+
+
+# Session.info flag set by save_model_config until its transaction ends
+_CONFIG_WRITE_PENDING = "embedding_config_write_pending"
+
+
+class _ConfigCache:
+    """
+    Process-wide read-through cache for embedding model configs, which change
+    rarely but are read on every embedding request. Entries expire after
+    CONFIG_CACHE_TTL and are handed out as deep copies, so a caller mutating
+    its config never changes another request's. It is cleared when a session
+    that saved a config commits.
+    """
+    
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: Dict[Hashable, tuple] = {}
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return copy.deepcopy(entry[1])
+    
+    def set(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+    
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+_config_cache = _ConfigCache(CONFIG_CACHE_TTL)
+
+
+@event.listens_for(Session, "after_commit")
+def _clear_config_cache_after_commit(session: Session) -> None:
+    """Drop cached configs once a config write is committed and visible to every session"""
+    if session.info.pop(_CONFIG_WRITE_PENDING, False):
+        _config_cache.clear()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_config_write_after_rollback(session: Session) -> None:
+    """A rolled back config write changed nothing, so the cache stays"""
+    session.info.pop(_CONFIG_WRITE_PENDING, None)
 
 
 class SQLAlchemyEmbeddingRepository(EmbeddingRepository):
-    """SQLAlchemy implementation of EmbeddingRepository"""
+    """
+    SQLAlchemy implementation of EmbeddingRepository.
+    Writes are not committed here and database errors propagate unchanged;
+    whoever owns the session commits once per unit of work or rolls back
+    (see wiring.get_db_session).
+    """
     
     def __init__(self, session: AsyncSession):
         self.session = session
     
     async def save(self, embedding: Embedding) -> Embedding:
         """Save embedding to database"""
-        try:
-            # Check if embedding exists
-            stmt = select(EmbeddingModel).where(EmbeddingModel.id == embedding.id)
-            result = await self.session.execute(stmt)
-            existing_embedding = result.scalar_one_or_none()
-            
-            if existing_embedding:
-                # Update existing embedding
-                await self._update_embedding_model(existing_embedding, embedding)
-                await self.session.commit()
-                return await self._model_to_embedding(existing_embedding)
-            else:
-                # Create new embedding
-                embedding_model = self._embedding_to_model(embedding)
-                self.session.add(embedding_model)
-                await self.session.commit()
-                await self.session.refresh(embedding_model)
-                return await self._model_to_embedding(embedding_model)
-                
-        except Exception as e:
-            await self.session.rollback()
-            raise Exception(f"Error saving embedding: {str(e)}")
+        values = self._embedding_to_dict(embedding)
+        embedding_model = (await self.session.execute(_UPSERT_EMBEDDING, [values])).scalar_one()
+        return self._model_to_embedding(embedding_model)
+    
+    async def save_many(self, embeddings: List[Embedding]) -> List[Embedding]:
+        """Save embeddings with one batched upsert; results follow the order of embeddings"""
+        if not embeddings:
+            return []
+        rows = [self._embedding_to_dict(embedding) for embedding in embeddings]
+        reject_duplicate_keys(rows)
+        embedding_models = (await self.session.execute(_UPSERT_EMBEDDING, rows)).scalars().all()
+        return self._models_to_embeddings(embedding_models)
+    
+    async def update_many(self, embeddings: List[Embedding]) -> None:
+        """Update existing embeddings with one bulk UPDATE by primary key"""
+        if not embeddings:
+            return
+        mappings = [
+            {name: value for name, value in self._embedding_to_dict(embedding).items() if name != "created_at"}
+            for embedding in embeddings
+        ]
+        await self.session.execute(update(EmbeddingModel), mappings)
+    
+    async def copy_embeddings(self, embeddings: List[Embedding]) -> int:
+        """
+        Bulk-load new embeddings with PostgreSQL COPY; returns the number of rows.
+        Insert-only, so an existing id fails the batch. Batches under COPY_THRESHOLD
+        and non-asyncpg connections go through save_many instead.
+        """
+        connection = await self.session.connection()
+        if len(embeddings) < COPY_THRESHOLD or connection.dialect.driver != "asyncpg":
+            return len(await self.save_many(embeddings))
+        rows = [self._embedding_to_dict(embedding) for embedding in embeddings]
+        columns = list(rows[0])
+        table = EmbeddingModel.__table__
+        
+        # Encode values the way an INSERT would (JSON columns, vector types, ...)
+        processors = [
+            table.c[name].type.dialect_impl(connection.dialect).bind_processor(connection.dialect)
+            for name in columns
+        ]
+        records = [
+            tuple(
+                process(value) if process else value
+                for process, value in zip(processors, row.values())
+            )
+            for row in rows
+        ]
+        
+        raw = (await connection.get_raw_connection()).driver_connection
+        await raw.copy_records_to_table(
+            table.name, records=records, columns=columns, schema_name=table.schema
+        )
+        return len(records)
     
     async def find_by_id(self, embedding_id: uuid.UUID) -> Optional[Embedding]:
         """Find embedding by ID"""
-        try:
-            stmt = select(EmbeddingModel).where(EmbeddingModel.id == embedding_id)
-            result = await self.session.execute(stmt)
-            embedding_model = result.scalar_one_or_none()
-            
-            if embedding_model:
-                return await self._model_to_embedding(embedding_model)
-            return None
-            
-        except Exception as e:
-            raise Exception(f"Error finding embedding: {str(e)}")
+        result = await self.session.execute(_FIND_EMBEDDING_BY_ID, {"id": embedding_id})
+        embedding_model = result.scalar_one_or_none()
+        
+        if embedding_model:
+            return self._model_to_embedding(embedding_model)
+        return None
     
     async def find_by_status(self, status: EmbeddingStatus) -> List[Embedding]:
         """Find embeddings by status"""
-        try:
-            stmt = select(EmbeddingModel).where(EmbeddingModel.status == status.value)
-            result = await self.session.execute(stmt)
-            embedding_models = result.scalars().all()
-            
-            return [await self._model_to_embedding(emb) for emb in embedding_models]
-            
-        except Exception as e:
-            raise Exception(f"Error finding embeddings by status: {str(e)}")
+        result = await self.session.execute(_FIND_EMBEDDINGS_BY_STATUS, {"status": EmbeddingStatus.name_of(status)})
+        embedding_models = result.scalars().all()
+        
+        return self._models_to_embeddings(embedding_models)
+    
+    async def find_ids_by_status(self, status: EmbeddingStatus) -> List[uuid.UUID]:
+        """Find IDs of embeddings by status, without transferring vectors"""
+        result = await self.session.execute(_FIND_EMBEDDING_IDS_BY_STATUS, {"status": EmbeddingStatus.name_of(status)})
+        
+        return list(result.scalars())
     
     async def find_by_type(self, embedding_type: EmbeddingType) -> List[Embedding]:
         """Find embeddings by type"""
-        try:
-            stmt = select(EmbeddingModel).where(EmbeddingModel.embedding_type == embedding_type.value)
-            result = await self.session.execute(stmt)
-            embedding_models = result.scalars().all()
-            
-            return [await self._model_to_embedding(emb) for emb in embedding_models]
-            
-        except Exception as e:
-            raise Exception(f"Error finding embeddings by type: {str(e)}")
+        result = await self.session.execute(_FIND_EMBEDDINGS_BY_TYPE, {"type": embedding_type.value})
+        embedding_models = result.scalars().all()
+        
+        return self._models_to_embeddings(embedding_models)
     
     async def find_by_model(self, model: str) -> List[Embedding]:
         """Find embeddings by model"""
-        try:
-            stmt = select(EmbeddingModel).where(EmbeddingModel.model == model)
-            result = await self.session.execute(stmt)
-            embedding_models = result.scalars().all()
-            
-            return [await self._model_to_embedding(emb) for emb in embedding_models]
-            
-        except Exception as e:
-            raise Exception(f"Error finding embeddings by model: {str(e)}")
+        result = await self.session.execute(_FIND_EMBEDDINGS_BY_MODEL, {"model": model})
+        embedding_models = result.scalars().all()
+        
+        return self._models_to_embeddings(embedding_models)
+    
+    async def find_by_document_id(self, document_id: uuid.UUID) -> List[Embedding]:
+        """Find embeddings of a document's chunks in one query"""
+        result = await self.session.execute(_FIND_EMBEDDINGS_BY_DOCUMENT_ID, {"document_id": document_id})
+        embedding_models = result.scalars().all()
+        
+        return self._models_to_embeddings(embedding_models)
+    
+    async def find_ids_by_model(self, model: str) -> List[uuid.UUID]:
+        """Find IDs of embeddings by model, without transferring vectors"""
+        result = await self.session.execute(_FIND_EMBEDDING_IDS_BY_MODEL, {"model": model})
+        
+        return list(result.scalars())
     
     async def delete(self, embedding_id: uuid.UUID) -> bool:
         """Delete embedding by ID"""
-        try:
-            stmt = delete(EmbeddingModel).where(EmbeddingModel.id == embedding_id)
-            result = await self.session.execute(stmt)
-            await self.session.commit()
-            
-            return result.rowcount > 0
-            
-        except Exception as e:
-            await self.session.rollback()
-            raise Exception(f"Error deleting embedding: {str(e)}")
+        deleted_id = (await self.session.execute(_DELETE_EMBEDDING, {"id": embedding_id})).scalar_one_or_none()
+        
+        return deleted_id is not None
+    
+    async def delete_many(self, embedding_ids: List[uuid.UUID]) -> int:
+        """Delete embeddings by IDs in one statement; returns how many existed"""
+        if not embedding_ids:
+            return 0
+        deleted_ids = (await self.session.execute(_DELETE_EMBEDDINGS, {"ids": embedding_ids})).scalars().all()
+        
+        return len(deleted_ids)
     
     async def save_model_config(self, model_config: EmbeddingModel) -> EmbeddingModel:
         """Save embedding model configuration"""
-        try:
-            # Check if model config exists
-            stmt = select(EmbeddingModelConfig).where(EmbeddingModelConfig.id == model_config.id)
-            result = await self.session.execute(stmt)
-            existing_config = result.scalar_one_or_none()
-            
-            if existing_config:
-                # Update existing config
-                await self._update_model_config(existing_config, model_config)
-                await self.session.commit()
-                return await self._model_to_config(existing_config)
-            else:
-                # Create new config
-                config_model = self._config_to_model(model_config)
-                self.session.add(config_model)
-                await self.session.commit()
-                await self.session.refresh(config_model)
-                return await self._model_to_config(config_model)
-                
-        except Exception as e:
-            await self.session.rollback()
-            raise Exception(f"Error saving model config: {str(e)}")
+        values = self._config_to_dict(model_config)
+        config_model = (await self.session.execute(_UPSERT_MODEL_CONFIG, [values])).scalar_one()
+        # The cache is cleared when this session commits; clearing now would let
+        # another request refill it with the old row before the commit
+        self.session.info[_CONFIG_WRITE_PENDING] = True
+        return self._model_to_config(config_model)
     
     async def find_model_config_by_id(self, config_id: uuid.UUID) -> Optional[EmbeddingModel]:
-        """Find model configuration by ID"""
-        try:
-            stmt = select(EmbeddingModelConfig).where(EmbeddingModelConfig.id == config_id)
-            result = await self.session.execute(stmt)
-            config_model = result.scalar_one_or_none()
-            
-            if config_model:
-                return await self._model_to_config(config_model)
-            return None
-            
-        except Exception as e:
-            raise Exception(f"Error finding model config: {str(e)}")
+        """Find model configuration by ID (cached for CONFIG_CACHE_TTL seconds)"""
+        use_cache = self._can_use_config_cache()
+        cached = _config_cache.get(("id", config_id)) if use_cache else None
+        if cached is not None:
+            return cached
+        result = await self.session.execute(_FIND_MODEL_CONFIG_BY_ID, {"id": config_id})
+        config_model = result.scalar_one_or_none()
+        
+        if config_model:
+            config = self._model_to_config(config_model)
+            if use_cache:
+                _config_cache.set(("id", config_id), copy.deepcopy(config))
+            return config
+        return None
     
     async def find_active_model_configs(self) -> List[EmbeddingModel]:
-        """Find all active model configurations"""
-        try:
-            stmt = select(EmbeddingModelConfig).where(EmbeddingModelConfig.is_active == True)
-            result = await self.session.execute(stmt)
-            config_models = result.scalars().all()
-            
-            return [await self._model_to_config(config) for config in config_models]
-            
-        except Exception as e:
-            raise Exception(f"Error finding active model configs: {str(e)}")
+        """Find all active model configurations (cached for CONFIG_CACHE_TTL seconds)"""
+        use_cache = self._can_use_config_cache()
+        cached = _config_cache.get("active") if use_cache else None
+        if cached is not None:
+            return cached
+        result = await self.session.execute(_FIND_ACTIVE_MODEL_CONFIGS)
+        config_models = result.scalars().all()
+        
+        configs = [self._model_to_config(config) for config in config_models]
+        if use_cache:
+            _config_cache.set("active", copy.deepcopy(configs))
+        return configs
+    
+    def _can_use_config_cache(self) -> bool:
+        """Bypass the shared cache while this session holds an uncommitted config write"""
+        return not self.session.info.get(_CONFIG_WRITE_PENDING, False)
     
     # Helper methods for conversion
-    def _embedding_to_model(self, embedding: Embedding) -> EmbeddingModel:
-        """Convert domain Embedding to SQLAlchemy model"""
-        return EmbeddingModel(
-            id=embedding.id,
-            vector=embedding.vector,
-            embedding_metadata=embedding.metadata,
-            embedding_type=embedding.embedding_type.value,
-            status=embedding.status.value,
-            created_at=embedding.created_at,
-            updated_at=embedding.updated_at,
-            tags=embedding.tags,
-            version=embedding.version,
-            dimension=embedding.dimension,
-            model=embedding.model
-        )
+    def _embedding_to_dict(self, embedding: Embedding) -> Dict[str, Any]:
+        """Convert domain Embedding to a column mapping"""
+        return {name: get(embedding) for name, get in _EMBEDDING_COLUMNS}
     
-    async def _update_embedding_model(self, model: EmbeddingModel, embedding: Embedding):
-        """Update SQLAlchemy model with domain embedding data"""
-        model.vector = embedding.vector
-        model.embedding_metadata = embedding.metadata
-        model.embedding_type = embedding.embedding_type.value
-        model.status = embedding.status.value
-        model.updated_at = embedding.updated_at
-        model.tags = embedding.tags
-        model.version = embedding.version
-        model.dimension = embedding.dimension
-        model.model = embedding.model
-    
-    async def _model_to_embedding(self, model: EmbeddingModel) -> Embedding:
+    def _models_to_embeddings(self, models: List[EmbeddingModel]) -> List[Embedding]:
+        """
+        Convert rows, decoding all vectors into one float32 matrix whose rows
+        back the entities; falls back per row for mixed dimensions or missing vectors
+        """
+        try:
+            vectors = np.asarray([model.vector for model in models], dtype=np.float32)
+        except (TypeError, ValueError):
+            return [self._model_to_embedding(model) for model in models]
+        return [self._model_to_embedding(model, vector) for model, vector in zip(models, vectors)]
+    
+    def _model_to_embedding(self, model: EmbeddingModel, vector: Optional[np.ndarray] = None) -> Embedding:
         """Convert SQLAlchemy model to domain Embedding"""
         return Embedding(
             id=model.id,
-            vector=model.vector,
+            vector=model.vector if vector is None else vector,
             metadata=model.embedding_metadata,
-            embedding_type=EmbeddingType(model.embedding_type),
-            status=EmbeddingStatus(model.status),
+            embedding_type=_EMBEDDING_TYPES[model.embedding_type],
+            status=EmbeddingStatus.from_name(model.status),
             created_at=model.created_at,
             updated_at=model.updated_at,
             tags=model.tags,
@@ -203,9 +325,9 @@ class SQLAlchemyEmbeddingRepository(EmbeddingRepository):
             model=model.model
         )
     
-    def _config_to_model(self, config: EmbeddingModel) -> EmbeddingModelConfig:
-        """Convert domain EmbeddingModel to SQLAlchemy model"""
-        return EmbeddingModelConfig(
+    def _config_to_dict(self, config: EmbeddingModel) -> Dict[str, Any]:
+        """Convert domain EmbeddingModel to a column mapping"""
+        return dict(
             id=config.id,
             name=config.name,
             config=config.config,
@@ -216,16 +338,7 @@ class SQLAlchemyEmbeddingRepository(EmbeddingRepository):
             embeddingmodel_metadata=config.metadata
         )
     
-    async def _update_model_config(self, model: EmbeddingModelConfig, config: EmbeddingModel):
-        """Update SQLAlchemy model with domain config data"""
-        model.name = config.name
-        model.config = config.config
-        model.updated_at = config.updated_at
-        model.description = config.description
-        model.is_active = config.is_active
-        model.embeddingmodel_metadata = config.metadata
-    
-    async def _model_to_config(self, model: EmbeddingModelConfig) -> EmbeddingModel:
+    def _model_to_config(self, model: EmbeddingModelConfig) -> EmbeddingModel:
         """Convert SQLAlchemy model to domain EmbeddingModel"""
         return EmbeddingModel(
             id=model.id,
@@ -1,11 +1,13 @@
 """
 SQLAlchemy User Aggregate Repository Implementation
 """
-from typing import Optional, List
+from operator import attrgetter
+from typing import Any, AsyncIterator, Callable, Dict, Optional, List
 from datetime import datetime
 
-from sqlalchemy import select
+from sqlalchemy import select, insert, delete, exists, bindparam
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload, selectinload
 
 from app.domain.user.aggregates import UserAggregate, UserAggregateRepository
 from app.domain.user.entities.user import User, UserRole, UserStatus
@@ -14,331 +16,356 @@ from app.domain.user.entities.session import Session
 from app.domain.user.entities.permission import Permission, PermissionType, PermissionScope
 from app.domain.user.value_objects.email import Email
 from app.infrastructure.db.models.user import User as UserModel, UserProfile as UserProfileModel, Session as SessionModel, Permission as PermissionModel
+from app.infrastructure.db.session import gather_on_sessions
+from app.infrastructure.db.upsert import upsert
+
+# Rows fetched per round-trip when streaming aggregates
+STREAM_BATCH_SIZE = 1000
+
+# Children of the aggregate, loaded with the user in one query per relationship
+# (UserModel.permissions is the column of permission names, so the permission
+# rows live on permissions_rel); any other relationship raises on access
+# rather than lazy-loading
+_AGGREGATE_LOAD_OPTS = (
+    selectinload(UserModel.profile),
+    selectinload(UserModel.permissions_rel),
+    selectinload(UserModel.sessions),
+    raiseload("*"),
+)
+
+# Stored value -> enum member; a dict hit is much cheaper than Enum.__call__ per row
+_USER_ROLES = {role.value: role for role in UserRole}
+_USER_STATUSES = {status.value: status for status in UserStatus}
+_PERMISSION_TYPES = {permission_type.value: permission_type for permission_type in PermissionType}
+_PERMISSION_SCOPES = {scope.value: scope for scope in PermissionScope}
+
+# Columns an upsert only writes on insert
+_CHILD_KEEP = ("id", "user_id", "created_at")
+_PERMISSION_KEEP = ("id", "user_id", "granted_at")
+
+# Column name and domain getter pairs, resolved once at import
+_USER_COLUMNS = (
+    ("id", attrgetter("id")),
+    ("email", attrgetter("email")),
+    ("username", attrgetter("username")),
+    ("full_name", attrgetter("full_name")),
+    ("hashed_password", attrgetter("hashed_password")),
+    ("role", attrgetter("role.value")),
+    ("status", attrgetter("status.value")),
+    ("created_at", attrgetter("created_at")),
+    ("updated_at", attrgetter("updated_at")),
+    ("last_login", attrgetter("last_login")),
+    ("email_verified", attrgetter("email_verified")),
+    ("phone", attrgetter("phone")),
+    ("department", attrgetter("department")),
+    ("permissions", lambda user: sorted(user.permissions)),
+    ("user_metadata", attrgetter("metadata")),
+)
+
+_PROFILE_COLUMNS = tuple((name, attrgetter(name)) for name in (
+    "id", "user_id", "avatar_url", "bio", "location", "website", "company", "job_title",
+    "skills", "preferences", "created_at", "updated_at",
+))
+
+_PERMISSION_COLUMNS = (
+    ("id", attrgetter("id")),
+    ("user_id", attrgetter("user_id")),
+    ("name", attrgetter("name")),
+    ("type", attrgetter("type.value")),
+    ("scope", attrgetter("scope.value")),
+    ("resource", attrgetter("resource")),
+    ("conditions", attrgetter("conditions")),
+    ("granted_by", attrgetter("granted_by")),
+    ("is_active", attrgetter("is_active")),
+    ("granted_at", attrgetter("granted_at")),
+    ("expires_at", attrgetter("expires_at")),
+)
+
+_SESSION_COLUMNS = tuple((name, attrgetter(name)) for name in (
+    "id", "user_id", "token", "refresh_token", "device_info", "ip_address", "user_agent",
+    "is_active", "expires_at", "created_at", "last_activity",
+))
+
+_USER_COLUMN_NAMES = tuple(name for name, _ in _USER_COLUMNS)
+_PROFILE_COLUMN_NAMES = tuple(name for name, _ in _PROFILE_COLUMNS)
+_PERMISSION_COLUMN_NAMES = tuple(name for name, _ in _PERMISSION_COLUMNS)
+_SESSION_COLUMN_NAMES = tuple(name for name, _ in _SESSION_COLUMNS)
+
+# Statements built once at import; per call only the bound values change
+_FIND_AGGREGATE_BY_ID = select(UserModel).options(*_AGGREGATE_LOAD_OPTS).where(UserModel.id == bindparam("id"))
+_FIND_AGGREGATE_BY_EMAIL = select(UserModel).options(*_AGGREGATE_LOAD_OPTS).where(
+    UserModel.email == bindparam("email")
+)
+# Every user in id order; selectinload fetches children once per yielded batch
+_FIND_ALL_AGGREGATES = select(UserModel).options(*_AGGREGATE_LOAD_OPTS).order_by(UserModel.id)
+# Reload after a save; rows written with Core statements replace the loaded collections
+_RELOAD_AGGREGATE = _FIND_AGGREGATE_BY_ID.execution_options(populate_existing=True)
+# Per-table lookups for fetch_user_aggregate, each run on its own session
+_FIND_USER_ROW = select(UserModel).options(raiseload("*")).where(UserModel.id == bindparam("id"))
+_FIND_PROFILE_ROW = select(UserProfileModel).where(UserProfileModel.user_id == bindparam("user_id"))
+_FIND_PERMISSION_ROWS = select(PermissionModel).where(PermissionModel.user_id == bindparam("user_id"))
+_FIND_SESSION_ROWS = select(SessionModel).where(SessionModel.user_id == bindparam("user_id"))
+_EXISTS_BY_EMAIL = select(exists().where(UserModel.email == bindparam("email")))
+_DELETE_STALE_PERMISSIONS = delete(PermissionModel).where(
+    PermissionModel.user_id == bindparam("user_id"),
+    PermissionModel.id.not_in(bindparam("ids", expanding=True)),
+)
+_UPSERT_USER = upsert(UserModel, _USER_COLUMN_NAMES)
+_UPSERT_PROFILE = upsert(UserProfileModel, _PROFILE_COLUMN_NAMES, keep=_CHILD_KEEP, conflict="user_id")
+_UPSERT_PERMISSION = upsert(PermissionModel, _PERMISSION_COLUMN_NAMES, keep=_PERMISSION_KEEP)
+_UPSERT_SESSION = upsert(SessionModel, _SESSION_COLUMN_NAMES, keep=_CHILD_KEEP)
+
+
+# ORM row -> domain entity converters, shared by the repository and fetch_user_aggregate
+def _model_to_user(model: UserModel) -> User:
+    """Convert ORM model to User entity"""
+    return User(
+        id=model.id,
+        email=model.email,
+        username=model.username,
+        full_name=model.full_name,
+        hashed_password=model.hashed_password,
+        role=_USER_ROLES[model.role],
+        status=_USER_STATUSES[model.status],
+        created_at=model.created_at,
+        updated_at=model.updated_at,
+        last_login=model.last_login,
+        email_verified=model.email_verified,
+        phone=model.phone,
+        department=model.department,
+        permissions=model.permissions or [],
+        metadata=model.user_metadata or {}
+    )
+
+
+def _model_to_profile(model: UserProfileModel) -> UserProfile:
+    """Convert ORM model to UserProfile entity"""
+    return UserProfile(
+        id=model.id,
+        user_id=model.user_id,
+        avatar_url=model.avatar_url,
+        bio=model.bio,
+        location=model.location,
+        website=model.website,
+        company=model.company,
+        job_title=model.job_title,
+        skills=model.skills,
+        preferences=model.preferences,
+        created_at=model.created_at,
+        updated_at=model.updated_at
+    )
+
+
+def _model_to_permission(model: PermissionModel) -> Permission:
+    """Convert ORM model to Permission entity"""
+    return Permission(
+        id=model.id,
+        user_id=model.user_id,
+        name=model.name,
+        type=_PERMISSION_TYPES[model.type],
+        scope=_PERMISSION_SCOPES[model.scope],
+        resource=model.resource,
+        conditions=model.conditions,
+        granted_by=model.granted_by,
+        is_active=model.is_active,
+        granted_at=model.granted_at,
+        expires_at=model.expires_at
+    )
+
+
+def _model_to_session(model: SessionModel) -> Session:
+    """Convert ORM model to Session entity"""
+    return Session(
+        id=model.id,
+        user_id=model.user_id,
+        token=model.token,
+        refresh_token=model.refresh_token,
+        device_info=model.device_info,
+        ip_address=model.ip_address,
+        user_agent=model.user_agent,
+        is_active=model.is_active,
+        expires_at=model.expires_at,
+        created_at=model.created_at,
+        last_activity=model.last_activity
+    )
+
+
+def _build_aggregate(user_model: UserModel, profile_model: Optional[UserProfileModel],
+                     permission_models, session_models) -> UserAggregate:
+    """Convert a user row and its child rows to UserAggregate"""
+    return UserAggregate(
+        user=_model_to_user(user_model),
+        profile=_model_to_profile(profile_model) if profile_model else None,
+        permissions=[_model_to_permission(m) for m in permission_models],
+        sessions=[_model_to_session(m) for m in session_models],
+    )
+
+
+def _model_to_aggregate(user_model: UserModel) -> UserAggregate:
+    """Convert ORM model, with its children loaded, to UserAggregate"""
+    return _build_aggregate(user_model, user_model.profile, user_model.permissions_rel, user_model.sessions)
 
 
 class SQLAlchemyUserAggregateRepository(UserAggregateRepository):
     """
     SQLAlchemy implementation of UserAggregate repository
-    Maps between ORM models and Domain aggregates
+    Maps between ORM models and Domain aggregates.
+    Aggregates found are memoized by id and email for the repository's
+    lifetime (one request, like its session); save_aggregate replaces them
+    with the aggregate it reloads, and a failed write clears them since its
+    rollback may have discarded what they hold. exists_by_email always asks
+    the database.
     """
     
     def __init__(self, session: AsyncSession):
         self.session = session
+        self._by_id_cache: Dict[str, UserAggregate] = {}
+        self._by_email_cache: Dict[str, UserAggregate] = {}
+    
+    def _remember(self, aggregate: UserAggregate) -> UserAggregate:
+        self._by_id_cache[aggregate.user.id] = aggregate
+        self._by_email_cache[aggregate.user.email] = aggregate
+        return aggregate
+    
+    def _forget_all(self) -> None:
+        self._by_id_cache.clear()
+        self._by_email_cache.clear()
     
     async def save_aggregate(self, aggregate: UserAggregate) -> UserAggregate:
         """Save entire user aggregate atomically"""
+        self._forget_all()
         try:
-            # 1. Save user
-            user_model = self._user_to_model(aggregate.user)
-            
-            # Check if user exists
-            existing_user = await self.session.execute(
-                select(UserModel).where(UserModel.id == aggregate.user.id)
-            )
-            user_model_result = existing_user.scalar_one_or_none()
-            
-            if user_model_result:
-                # Update existing user
-                self._update_user_model(user_model_result, aggregate.user)
-            else:
-                # Create new user
-                self.session.add(user_model)
-            
-            # 2. Save profile (if exists)
-            if aggregate.profile:
-                profile_model = self._profile_to_model(aggregate.profile)
-                existing_profile = await self.session.execute(
-                    select(UserProfileModel).where(UserProfileModel.user_id == aggregate.user.id)
-                )
-                profile_model_result = existing_profile.scalar_one_or_none()
+            # 1. Save user; each write below is one INSERT ... ON CONFLICT DO UPDATE,
+            # so no SELECT is needed to tell a new row from an existing one
+            await self.session.execute(_UPSERT_USER, [self._user_to_dict(aggregate.user)])
                 
-                if profile_model_result:
-                    # Update existing profile
-                    self._update_profile_model(profile_model_result, aggregate.profile)
-                else:
-                    # Create new profile
-                    self.session.add(profile_model)
-            
-            # 3. Save permissions (if any)
+            # 2. Save profile (if exists); a user has one profile, matched by user_id
+            if aggregate.profile:
+                await self.session.execute(_UPSERT_PROFILE, [self._profile_to_dict(aggregate.profile)])
+                    
+            # 3. Save permissions (if any): drop the user's rows that are no
+            # longer granted, then upsert the rest in one batch
             if aggregate.permissions:
-                # Delete existing permissions for this user
-                existing_permissions = await self.session.execute(
-                    select(PermissionModel).where(PermissionModel.user_id == aggregate.user.id)
+                await self.session.execute(
+                    _DELETE_STALE_PERMISSIONS,
+                    {"user_id": aggregate.user.id, "ids": [permission.id for permission in aggregate.permissions]},
+                )
+                await self.session.execute(
+                    _UPSERT_PERMISSION,
+                    [self._permission_to_dict(permission) for permission in aggregate.permissions],
                 )
-                for perm in existing_permissions.scalars():
-                    await self.session.delete(perm)
                 
-                # Add new permissions
-                for permission in aggregate.permissions:
-                    permission_model = self._permission_to_model(permission)
-                    self.session.add(permission_model)
-            
-            # 4. Save sessions (if any)
+            # 4. Save sessions (if any) in one batched upsert
             if aggregate.sessions:
-                for session in aggregate.sessions:
-                    session_model = self._session_to_model(session)
-                    existing_session = await self.session.execute(
-                        select(SessionModel).where(SessionModel.id == session.id)
-                    )
-                    session_model_result = existing_session.scalar_one_or_none()
+                await self.session.execute(
+                    _UPSERT_SESSION, [self._session_to_dict(session) for session in aggregate.sessions]
+                )
                     
-                    if session_model_result:
-                        # Update existing session
-                        self._update_session_model(session_model_result, session)
-                    else:
-                        # Create new session
-                        self.session.add(session_model)
-            
             # 5. Commit transaction
             await self.session.commit()
-            await self.session.refresh(user_model)
             
-            # 6. Return updated aggregate
-            return await self._model_to_aggregate(user_model)
+            # 6. Return updated aggregate (children added above are not in the
+            # loaded collections yet, so overwrite them); later finds in this
+            # request reuse it instead of loading it again
+            result = await self.session.execute(_RELOAD_AGGREGATE, {"id": aggregate.user.id})
+            return self._remember(_model_to_aggregate(result.scalar_one()))
             
         except Exception as e:
+            self._forget_all()
+            await self.session.rollback()
+            raise e
+    
+    async def bulk_save_users(self, users: List[User]) -> None:
+        """Insert new users with one executemany Core insert, skipping the ORM unit of work"""
+        if not users:
+            return
+        try:
+            await self.session.execute(insert(UserModel), [self._user_to_dict(user) for user in users])
+            await self.session.commit()
+        except Exception as e:
+            self._forget_all()
             await self.session.rollback()
             raise e
     
     async def find_aggregate_by_id(self, user_id: str) -> Optional[UserAggregate]:
         """Find user aggregate by ID"""
-        result = await self.session.execute(
-            select(UserModel).where(UserModel.id == user_id)
-        )
+        cached = self._by_id_cache.get(user_id)
+        if cached is not None:
+            return cached
+        
+        result = await self.session.execute(_FIND_AGGREGATE_BY_ID, {"id": user_id})
         user_model = result.scalar_one_or_none()
         
         if not user_model:
             return None
-        
-        return await self._model_to_aggregate(user_model)
+            
+        return self._remember(_model_to_aggregate(user_model))
     
     async def find_aggregate_by_email(self, email: str) -> Optional[UserAggregate]:
         """Find user aggregate by email"""
-        result = await self.session.execute(
-            select(UserModel).where(UserModel.email == email.lower())
-        )
+        email = email.lower()
+        cached = self._by_email_cache.get(email)
+        if cached is not None:
+            return cached
+        
+        result = await self.session.execute(_FIND_AGGREGATE_BY_EMAIL, {"email": email})
         user_model = result.scalar_one_or_none()
         
         if not user_model:
             return None
-        
-        return await self._model_to_aggregate(user_model)
+            
+        return self._remember(_model_to_aggregate(user_model))
     
     async def exists_by_email(self, email: str) -> bool:
         """Check if user exists by email"""
-        result = await self.session.execute(
-            select(UserModel.id).where(UserModel.email == email.lower())
-        )
-        return result.scalar_one_or_none() is not None
-    
-    async def _model_to_aggregate(self, user_model: UserModel) -> UserAggregate:
-        """Convert ORM model to UserAggregate"""
-        # 1. Create user entity
-        user = self._model_to_user(user_model)
-        
-        # 2. Create aggregate
-        aggregate = UserAggregate(user=user)
-        
-        # 3. Load profile if exists
-        profile_result = await self.session.execute(
-            select(UserProfileModel).where(UserProfileModel.user_id == user_model.id)
-        )
-        profile_model = profile_result.scalar_one_or_none()
-        if profile_model:
-            aggregate.profile = self._model_to_profile(profile_model)
-        
-        # 4. Load permissions
-        permissions_result = await self.session.execute(
-            select(PermissionModel).where(PermissionModel.user_id == user_model.id)
-        )
-        for perm_model in permissions_result.scalars():
-            aggregate.permissions.append(self._model_to_permission(perm_model))
-        
-        # 5. Load sessions
-        sessions_result = await self.session.execute(
-            select(SessionModel).where(SessionModel.user_id == user_model.id)
-        )
-        for session_model in sessions_result.scalars():
-            aggregate.sessions.append(self._model_to_session(session_model))
-        
-        return aggregate
+        email = email.lower()
+        return bool(await self.session.scalar(_EXISTS_BY_EMAIL, {"email": email}))
     
-    def _model_to_user(self, model: UserModel) -> User:
-        """Convert ORM model to User entity"""
-        return User(
-            id=model.id,
-            email=model.email,
-            username=model.username,
-            full_name=model.full_name,
-            hashed_password=model.hashed_password,
-            role=UserRole(model.role),
-            status=UserStatus(model.status),
-            created_at=model.created_at,
-            updated_at=model.updated_at,
-            last_login=model.last_login,
-            email_verified=model.email_verified,
-            phone=model.phone,
-            department=model.department,
-            permissions=model.permissions or [],
-            metadata=model.user_metadata or {}
-        )
+    async def stream_aggregates(self, batch_size: int = STREAM_BATCH_SIZE) -> AsyncIterator[UserAggregate]:
+        """Stream every user aggregate, holding one batch of users and their children in memory at a time"""
+        result = await self.session.stream_scalars(_FIND_ALL_AGGREGATES.execution_options(yield_per=batch_size))
+        async for user_model in result:
+            yield _model_to_aggregate(user_model)
     
-    def _user_to_model(self, user: User) -> UserModel:
-        """Convert User entity to ORM model"""
-        return UserModel(
-            id=user.id,
-            email=user.email,
-            username=user.username,
-            full_name=user.full_name,
-            hashed_password=user.hashed_password,
-            role=user.role.value,
-            status=user.status.value,
-            created_at=user.created_at,
-            updated_at=user.updated_at,
-            last_login=user.last_login,
-            email_verified=user.email_verified,
-            phone=user.phone,
-            department=user.department,
-            permissions=user.permissions,
-            user_metadata=user.metadata
-        )
-    
-    def _update_user_model(self, model: UserModel, user: User) -> None:
-        """Update existing model with user data"""
-        model.email = user.email
-        model.username = user.username
-        model.full_name = user.full_name
-        model.hashed_password = user.hashed_password
-        model.role = user.role.value
-        model.status = user.status.value
-        model.updated_at = user.updated_at
-        model.last_login = user.last_login
-        model.email_verified = user.email_verified
-        model.phone = user.phone
-        model.department = user.department
-        model.permissions = user.permissions
-        model.user_metadata = user.metadata
+    def _user_to_dict(self, user: User) -> Dict[str, Any]:
+        """Convert User entity to a column mapping for Core insert/upsert"""
+        return {name: get(user) for name, get in _USER_COLUMNS}
     
     # Profile conversion methods
-    def _profile_to_model(self, profile: UserProfile) -> UserProfileModel:
-        """Convert UserProfile entity to ORM model"""
-        return UserProfileModel(
-            id=profile.id,
-            user_id=profile.user_id,
-            avatar_url=profile.avatar_url,
-            bio=profile.bio,
-            location=profile.location,
-            website=profile.website,
-            company=profile.company,
-            job_title=profile.job_title,
-            skills=profile.skills,
-            preferences=profile.preferences,
-            created_at=profile.created_at,
-            updated_at=profile.updated_at
-        )
-    
-    def _model_to_profile(self, model: UserProfileModel) -> UserProfile:
-        """Convert ORM model to UserProfile entity"""
-        return UserProfile(
-            id=model.id,
-            user_id=model.user_id,
-            avatar_url=model.avatar_url,
-            bio=model.bio,
-            location=model.location,
-            website=model.website,
-            company=model.company,
-            job_title=model.job_title,
-            skills=model.skills,
-            preferences=model.preferences,
-            created_at=model.created_at,
-            updated_at=model.updated_at
-        )
-    
-    def _update_profile_model(self, model: UserProfileModel, profile: UserProfile) -> None:
-        """Update existing profile model with profile data"""
-        model.avatar_url = profile.avatar_url
-        model.bio = profile.bio
-        model.location = profile.location
-        model.website = profile.website
-        model.company = profile.company
-        model.job_title = profile.job_title
-        model.skills = profile.skills
-        model.preferences = profile.preferences
-        model.updated_at = profile.updated_at
+    def _profile_to_dict(self, profile: UserProfile) -> Dict[str, Any]:
+        """Convert UserProfile entity to a column mapping for Core upsert"""
+        return {name: get(profile) for name, get in _PROFILE_COLUMNS}
     
     # Permission conversion methods
-    def _permission_to_model(self, permission: Permission) -> PermissionModel:
-        """Convert Permission entity to ORM model"""
-        return PermissionModel(
-            id=permission.id,
-            user_id=permission.user_id,
-            name=permission.name,
-            type=permission.type.value,
-            scope=permission.scope.value,
-            resource=permission.resource,
-            conditions=permission.conditions,
-            granted_by=permission.granted_by,
-            is_active=permission.is_active,
-            granted_at=permission.granted_at,
-            expires_at=permission.expires_at
-        )
-    
-    def _model_to_permission(self, model: PermissionModel) -> Permission:
-        """Convert ORM model to Permission entity"""
-        return Permission(
-            id=model.id,
-            user_id=model.user_id,
-            name=model.name,
-            type=PermissionType(model.type),
-            scope=PermissionScope(model.scope),
-            resource=model.resource,
-            conditions=model.conditions,
-            granted_by=model.granted_by,
-            is_active=model.is_active,
-            granted_at=model.granted_at,
-            expires_at=model.expires_at
-        )
+    def _permission_to_dict(self, permission: Permission) -> Dict[str, Any]:
+        """Convert Permission entity to a column mapping for Core upsert"""
+        return {name: get(permission) for name, get in _PERMISSION_COLUMNS}
     
     # Session conversion methods
-    def _session_to_model(self, session: Session) -> SessionModel:
-        """Convert Session entity to ORM model"""
-        return SessionModel(
-            id=session.id,
-            user_id=session.user_id,
-            token=session.token,
-            refresh_token=session.refresh_token,
-            device_info=session.device_info,
-            ip_address=session.ip_address,
-            user_agent=session.user_agent,
-            is_active=session.is_active,
-            expires_at=session.expires_at,
-            created_at=session.created_at,
-            last_activity=session.last_activity
-        )
-    
-    def _model_to_session(self, model: SessionModel) -> Session:
-        """Convert ORM model to Session entity"""
-        return Session(
-            id=model.id,
-            user_id=model.user_id,
-            token=model.token,
-            refresh_token=model.refresh_token,
-            device_info=model.device_info,
-            ip_address=model.ip_address,
-            user_agent=model.user_agent,
-            is_active=model.is_active,
-            expires_at=model.expires_at,
-            created_at=model.created_at,
-            last_activity=model.last_activity
-        )
-    
-    def _update_session_model(self, model: SessionModel, session: Session) -> None:
-        """Update existing session model with session data"""
-        model.token = session.token
-        model.refresh_token = session.refresh_token
-        model.device_info = session.device_info
-        model.ip_address = session.ip_address
-        model.user_agent = session.user_agent
-        model.is_active = session.is_active
-        model.expires_at = session.expires_at
-        model.last_activity = session.last_activity
+    def _session_to_dict(self, session: Session) -> Dict[str, Any]:
+        """Convert Session entity to a column mapping for Core upsert"""
+        return {name: get(session) for name, get in _SESSION_COLUMNS}
+
+
+async def fetch_user_aggregate(session_factory: Callable[[], AsyncSession],
+                               user_id: str) -> Optional[UserAggregate]:
+    """
+    Load a user aggregate with the user, profile, permission and session
+    lookups running concurrently (see gather_on_sessions). Read-only fallback
+    for databases where the eager-loaded find_aggregate_by_id cannot be used.
+    """
+    params = {"id": user_id, "user_id": user_id}
+    user_model, profile_model, permission_models, session_models = await gather_on_sessions(
+        session_factory,
+        lambda session: session.scalar(_FIND_USER_ROW, params),
+        lambda session: session.scalar(_FIND_PROFILE_ROW, params),
+        lambda session: _all(session, _FIND_PERMISSION_ROWS, params),
+        lambda session: _all(session, _FIND_SESSION_ROWS, params),
+    )
+    if not user_model:
+        return None
+    return _build_aggregate(user_model, profile_model, permission_models, session_models)
+
+
+async def _all(session: AsyncSession, stmt, params) -> list:
+    return list((await session.execute(stmt, params)).scalars())
@@ -1,16 +1,48 @@
 """
 SQLAlchemy User Repository Implementation
 """
-from typing import Optional, List
+from operator import attrgetter
+from typing import Any, AsyncIterator, Dict, List, Optional
 from datetime import datetime
 
-from sqlalchemy import select
+from sqlalchemy import delete, exists, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
 
 from app.domain.user.repository import UserRepository
 from app.domain.user.entities.user import User, UserRole, UserStatus
 from app.domain.user.value_objects.email import Email
 from app.infrastructure.db.models.user import User as UserModel
+from app.infrastructure.db.upsert import reject_duplicate_keys, upsert
+
+# Rows fetched per round-trip when streaming user lists
+STREAM_BATCH_SIZE = 500
+
+# Column name and domain getter pairs, resolved once at import
+_USER_COLUMNS = (
+    ("id", attrgetter("id")),
+    ("email", attrgetter("email")),
+    ("username", attrgetter("username")),
+    ("full_name", attrgetter("full_name")),
+    ("hashed_password", attrgetter("hashed_password")),
+    ("role", attrgetter("role.value")),
+    ("status", attrgetter("status.value")),
+    ("created_at", attrgetter("created_at")),
+    ("updated_at", attrgetter("updated_at")),
+    ("last_login", attrgetter("last_login")),
+    ("email_verified", attrgetter("email_verified")),
+    ("phone", attrgetter("phone")),
+    ("department", attrgetter("department")),
+    ("permissions", lambda user: sorted(user.permissions)),
+    ("user_metadata", attrgetter("metadata")),
+)
+
+# Base of every user read; _to_domain only reads columns, so any relationship
+# access raises instead of lazy-loading a row at a time
+_SELECT_USERS = select(UserModel).options(raiseload("*"))
+
+# Built once at import: INSERT ... ON CONFLICT (id) DO UPDATE ... RETURNING the user
+_UPSERT_USER = upsert(UserModel, [name for name, _ in _USER_COLUMNS])
 
 
 class SQLAlchemyUserRepository(UserRepository):
@@ -25,7 +57,7 @@ class SQLAlchemyUserRepository(UserRepository):
     async def find_by_id(self, user_id: str) -> Optional[User]:
         """Find user by ID"""
         result = await self.session.execute(
-            select(UserModel).where(UserModel.id == user_id)
+            _SELECT_USERS.where(UserModel.id == user_id)
         )
         user_model = result.scalar_one_or_none()
         if not user_model:
@@ -36,7 +68,7 @@ class SQLAlchemyUserRepository(UserRepository):
     async def find_by_email(self, email: Email) -> Optional[User]:
         """Find user by email"""
         result = await self.session.execute(
-            select(UserModel).where(UserModel.email == email.value.lower())
+            _SELECT_USERS.where(UserModel.email == email.value.lower())
         )
         user_model = result.scalar_one_or_none()
         if not user_model:
@@ -47,7 +79,7 @@ class SQLAlchemyUserRepository(UserRepository):
     async def find_by_username(self, username: str) -> Optional[User]:
         """Find user by username"""
         result = await self.session.execute(
-            select(UserModel).where(UserModel.username == username.lower())
+            _SELECT_USERS.where(UserModel.username == username.lower())
         )
         user_model = result.scalar_one_or_none()
         if not user_model:
@@ -56,107 +88,97 @@ class SQLAlchemyUserRepository(UserRepository):
         return self._to_domain(user_model)
     
     async def save(self, user: User) -> User:
-        """Save or update user"""
-        # Check if exists
-        existing = await self.session.execute(
-            select(UserModel).where(UserModel.id == user.id)
-        )
-        user_model = existing.scalar_one_or_none()
-        
-        if user_model:
-            # Update existing
-            self._update_model(user_model, user)
-        else:
-            # Create new
-            user_model = self._to_model(user)
-            self.session.add(user_model)
-        
+        """Save or update user in one upsert"""
+        result = await self.session.execute(_UPSERT_USER, [self._to_dict(user)])
+        user_model = result.scalar_one()
         await self.session.commit()
-        await self.session.refresh(user_model)
         
         return self._to_domain(user_model)
     
+    async def save_many(self, users: List[User]) -> List[User]:
+        """
+        Save users with one batched upsert (multi-row INSERTs of insertmanyvalues_page_size rows).
+        Returned users follow the order of users (upsert() sorts RETURNING by parameter order)
+        """
+        if not users:
+            return []
+        rows = [self._to_dict(user) for user in users]
+        reject_duplicate_keys(rows)
+        result = await self.session.execute(_UPSERT_USER, rows)
+        user_models = result.scalars().all()
+        await self.session.commit()
+        
+        return [self._to_domain(model) for model in user_models]
+    
     async def delete(self, user_id: str) -> bool:
         """Delete user by ID"""
         result = await self.session.execute(
-            select(UserModel).where(UserModel.id == user_id)
+            delete(UserModel).where(UserModel.id == user_id).returning(UserModel.id)
         )
-        user_model = result.scalar_one_or_none()
-        if not user_model:
-            return False
-        
-        await self.session.delete(user_model)
+        deleted = result.scalar_one_or_none() is not None
         await self.session.commit()
-        return True
+        return deleted
     
     async def list_all(
         self, limit: int = 100, offset: int = 0, filters: Optional[dict] = None
-    ) -> List[User]:
-        """List all users with pagination and filters"""
-        query = select(UserModel)
-        
-        # Apply filters
-        if filters:
-            if filters.get("role"):
-                query = query.where(UserModel.role == filters["role"])
-            if filters.get("status"):
-                query = query.where(UserModel.status == filters["status"])
+    ) -> AsyncIterator[User]:
+        """Stream all users with pagination and filters"""
+        query = self._apply_filters(_SELECT_USERS, filters)
         
         # Apply pagination
         query = query.offset(offset).limit(limit)
         
-        result = await self.session.execute(query)
-        user_models = result.scalars().all()
-        
-        return [self._to_domain(model) for model in user_models]
+        async for model in self._stream(query):
+            yield self._to_domain(model)
     
     async def count(self, filters: Optional[dict] = None) -> int:
         """Count users with optional filters"""
-        query = select(UserModel)
-        
-        if filters:
-            if filters.get("role"):
-                query = query.where(UserModel.role == filters["role"])
-            if filters.get("status"):
-                query = query.where(UserModel.status == filters["status"])
-        
+        query = self._apply_filters(select(func.count()).select_from(UserModel), filters)
         result = await self.session.execute(query)
-        return len(result.scalars().all())
+        return result.scalar_one()
     
     async def exists_by_email(self, email: Email) -> bool:
         """Check if user exists by email"""
-        result = await self.session.execute(
-            select(UserModel.id).where(UserModel.email == email.value.lower())
-        )
-        return result.scalar_one_or_none() is not None
+        stmt = select(exists().where(UserModel.email == email.value.lower()))
+        return bool(await self.session.scalar(stmt))
     
     async def exists_by_username(self, username: str) -> bool:
         """Check if user exists by username"""
-        result = await self.session.execute(
-            select(UserModel.id).where(UserModel.username == username.lower())
-        )
-        return result.scalar_one_or_none() is not None
+        stmt = select(exists().where(UserModel.username == username.lower()))
+        return bool(await self.session.scalar(stmt))
     
-    async def find_by_role(self, role: str) -> List[User]:
-        """Find all users with specific role"""
-        result = await self.session.execute(
-            select(UserModel).where(UserModel.role == role)
-        )
-        user_models = result.scalars().all()
-        return [self._to_domain(model) for model in user_models]
+    async def find_by_role(self, role: str) -> AsyncIterator[User]:
+        """Stream all users with specific role"""
+        async for model in self._stream(_SELECT_USERS.where(UserModel.role == role)):
+            yield self._to_domain(model)
     
-    async def search(self, query: str, limit: int = 50) -> List[User]:
-        """Search users by name, email, or username"""
+    async def search(self, query: str, limit: int = 50) -> AsyncIterator[User]:
+        """Stream users matching name, email, or username"""
         search_term = f"%{query.lower()}%"
-        result = await self.session.execute(
-            select(UserModel).where(
-                (UserModel.email.ilike(search_term)) |
-                (UserModel.username.ilike(search_term)) |
-                (UserModel.full_name.ilike(search_term))
-            ).limit(limit)
+        stmt = _SELECT_USERS.where(
+            (UserModel.email.ilike(search_term)) |
+            (UserModel.username.ilike(search_term)) |
+            (UserModel.full_name.ilike(search_term))
+        ).limit(limit)
+        async for model in self._stream(stmt):
+            yield self._to_domain(model)
+    
+    def _apply_filters(self, query, filters: Optional[dict]):
+        """Add the role/status filters shared by list_all and count"""
+        if filters:
+            if filters.get("role"):
+                query = query.where(UserModel.role == filters["role"])
+            if filters.get("status"):
+                query = query.where(UserModel.status == filters["status"])
+        return query
+    
+    async def _stream(self, stmt) -> AsyncIterator[UserModel]:
+        """Stream ORM rows through a server-side cursor in fixed-size batches"""
+        result = await self.session.stream_scalars(
+            stmt.execution_options(yield_per=STREAM_BATCH_SIZE)
         )
-        user_models = result.scalars().all()
-        return [self._to_domain(model) for model in user_models]
+        async for model in result:
+            yield model
     
     def _to_domain(self, model: UserModel) -> User:
         """Map ORM model to Domain entity"""
@@ -192,38 +214,6 @@ class SQLAlchemyUserRepository(UserRepository):
             metadata=model.user_metadata or {},
         )
     
-    def _to_model(self, user: User) -> UserModel:
-        """Map Domain entity to ORM model"""
-        return UserModel(
-            id=user.id,
-            email=user.email,
-            username=user.username,
-            full_name=user.full_name,
-            hashed_password=user.hashed_password,
-            role=user.role.value,
-            status=user.status.value,
-            created_at=user.created_at,
-            updated_at=user.updated_at,
-            last_login=user.last_login,
-            email_verified=user.email_verified,
-            phone=user.phone,
-            department=user.department,
-            permissions=user.permissions,
-            user_metadata=user.metadata,
-        )
-    
-    def _update_model(self, model: UserModel, user: User) -> None:
-        """Update existing model with user data"""
-        model.email = user.email
-        model.username = user.username
-        model.full_name = user.full_name
-        model.hashed_password = user.hashed_password
-        model.role = user.role.value
-        model.status = user.status.value
-        model.updated_at = user.updated_at
-        model.last_login = user.last_login
-        model.email_verified = user.email_verified
-        model.phone = user.phone
-        model.department = user.department
-        model.permissions = user.permissions
-        model.user_metadata = user.metadata
+    def _to_dict(self, user: User) -> Dict[str, Any]:
+        """Map Domain entity to a column mapping for Core insert/upsert"""
+        return {name: get(user) for name, get in _USER_COLUMNS}
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-from typing import Optional, List, Dict
+from typing import AsyncIterator, Optional, Dict
 from datetime import datetime
 
-from app.domain.user.repository import UserRepository
+from app.domain.user.repository import UserRepository, collect
 from app.domain.user.entities.user import User, UserRole, UserStatus
 from app.domain.user.value_objects.email import Email
 
@@ -62,7 +62,7 @@ class InMemoryUserRepository(UserRepository):
 
     async def list_all(
         self, limit: int = 100, offset: int = 0, filters: Optional[dict] = None
-    ) -> List[User]:
+    ) -> AsyncIterator[User]:
         users = list(self._users_by_id.values())
         # Simple filtering by role/status if provided
         if filters:
@@ -72,10 +72,13 @@ class InMemoryUserRepository(UserRepository):
                 users = [u for u in users if u.role.value == role]
             if status:
                 users = [u for u in users if u.status.value == status]
-        return users[offset : offset + limit]
+        for user in users[offset : offset + limit]:
+            yield user
 
     async def count(self, filters: Optional[dict] = None) -> int:
-        return len(await self.list_all(filters=filters))
+        if not filters:
+            return len(self._users_by_id)
+        return len(await collect(self.list_all(limit=len(self._users_by_id), filters=filters)))
 
     async def exists_by_email(self, email: Email) -> bool:
         return email.value.lower() in self._users_by_email
@@ -83,16 +86,19 @@ class InMemoryUserRepository(UserRepository):
     async def exists_by_username(self, username: str) -> bool:
         return username.lower() in self._users_by_username
 
-    async def find_by_role(self, role: str) -> List[User]:
-        return [u for u in self._users_by_id.values() if u.role.value == role]
+    async def find_by_role(self, role: str) -> AsyncIterator[User]:
+        for u in list(self._users_by_id.values()):
+            if u.role.value == role:
+                yield u
 
-    async def search(self, query: str, limit: int = 50) -> List[User]:
+    async def search(self, query: str, limit: int = 50) -> AsyncIterator[User]:
         q = query.lower()
-        results = [
-            u
-            for u in self._users_by_id.values()
-            if q in u.email or q in u.username or q in u.full_name.lower()
-        ]
-        return results[:limit]
+        found = 0
+        for u in list(self._users_by_id.values()):
+            if found >= limit:
+                break
+            if q in u.email or q in u.username or q in u.full_name.lower():
+                found += 1
+                yield u
 
 
@@ -1,7 +1,8 @@
 """
 Database Session Utilities
 """
-from typing import Optional
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 
@@ -32,3 +33,17 @@ async def get_db_session_sync() -> Optional[AsyncSession]:
             return session
     except Exception:
         return None
+
+
+async def gather_on_sessions(session_factory: Callable[[], AsyncSession],
+                             *queries: Callable[[AsyncSession], Awaitable[Any]]) -> List[Any]:
+    """
+    Run queries concurrently, each on its own pooled session since an
+    AsyncSession must not be shared between tasks. Latency is that of the
+    slowest query instead of the sum of all of them; results keep query order.
+    """
+    async def run(query: Callable[[AsyncSession], Awaitable[Any]]) -> Any:
+        async with session_factory() as session:
+            return await query(session)
+    
+    return await asyncio.gather(*(run(query) for query in queries))
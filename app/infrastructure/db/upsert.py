@@ -0,0 +1,38 @@
+"""
+PostgreSQL Upserts
+Single-statement INSERT ... ON CONFLICT DO UPDATE for repository saves
+"""
+from typing import Any, Collection, Dict, Iterable, Sequence
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+
+def upsert(model, columns: Iterable[str], keep: Collection[str] = ("id", "created_at"), conflict: str = "id"):
+    """
+    INSERT ... ON CONFLICT (<conflict>) DO UPDATE ... RETURNING the ORM entity.
+    Columns in keep are only written on insert; the returned row replaces
+    any copy of the instance already in the session's identity map.
+    conflict names the unique column that identifies an existing row.
+    Executed with many rows, the returned entities follow the order of the
+    parameter rows even when insertmanyvalues splits them into batches;
+    check batches with reject_duplicate_keys first.
+    """
+    stmt = pg_insert(model)
+    return (
+        stmt.on_conflict_do_update(
+            index_elements=[getattr(model, conflict)],
+            set_={name: stmt.excluded[name] for name in columns if name not in keep},
+        )
+        .returning(model, sort_by_parameter_order=True)
+        .execution_options(populate_existing=True)
+    )
+
+
+def reject_duplicate_keys(rows: Sequence[Dict[str, Any]], conflict: str = "id") -> None:
+    """
+    Raise ValueError if two rows share a conflict key: PostgreSQL cannot
+    update the same row twice in one ON CONFLICT DO UPDATE command
+    """
+    keys = {row[conflict] for row in rows}
+    if len(keys) != len(rows):
+        raise ValueError(f"Duplicate {conflict} values in one upsert batch")
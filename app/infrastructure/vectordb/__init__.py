@@ -0,0 +1,5 @@
+from .in_memory_embedding_repository import InMemoryEmbeddingRepository
+
+__all__ = [
+    "InMemoryEmbeddingRepository"
+]
@@ -0,0 +1,295 @@
+"""
+In-memory Embedding Repository
+Keeps all vectors in one contiguous (N, d) float32 bank with parallel
+metadata arrays, so similarity search is a single streamed matrix scan.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+import orjson
+
+from app.domain.embedding.repository import EmbeddingRepository
+from app.domain.embedding.entities import Embedding, EmbeddingModel, EmbeddingStatus, EmbeddingType
+from app.domain.embedding.entities.value_objects import EmbeddingVector, EmbeddingMetadata
+
+
+_STATUSES: List[EmbeddingStatus] = list(EmbeddingStatus)
+
+# On-disk layout written by persist() and read by open_mmap()
+_BANK_FILE = "bank.npy"
+_NORMS_FILE = "norms.npy"
+_STATUSES_FILE = "statuses.npy"
+_ROWS_FILE = "rows.json"
+
+
+class InMemoryEmbeddingRepository(EmbeddingRepository):
+    """
+    Struct-of-arrays EmbeddingRepository for development and single-node serving.
+    Row i of every array describes the same embedding; deleted rows are
+    back-filled from the last row so the live rows stay contiguous.
+    """
+
+    def __init__(self, dimension: Optional[int] = None, initial_capacity: int = 1024) -> None:
+        self._dimension = dimension
+        self._capacity = max(initial_capacity, 1)
+        self._size = 0
+        self._bank: Optional[np.ndarray] = None
+        self._norms = np.empty(self._capacity, dtype=np.float32)
+        self._statuses = np.empty(self._capacity, dtype=np.uint8)
+        if dimension is not None:
+            self._bank = np.empty((self._capacity, dimension), dtype=np.float32)
+
+        # Parallel metadata arrays
+        self._ids: List[str] = []
+        self._models: List[str] = []
+        self._metadata: List[EmbeddingMetadata] = []
+        self._types: List[EmbeddingType] = []
+        self._created_at: List[datetime] = []
+        self._updated_at: List[datetime] = []
+        self._tags: List[Dict[str, Any]] = []
+        self._versions: List[int] = []
+        self._id_to_row: Dict[str, int] = {}
+
+        self._embedding_models: Dict[str, EmbeddingModel] = {}
+
+    def _columns(self) -> tuple:
+        return (
+            self._ids, self._models, self._metadata, self._types,
+            self._created_at, self._updated_at, self._tags, self._versions,
+        )
+
+    # Bank management
+    def _ensure_bank(self, dimension: int) -> None:
+        if self._bank is None:
+            self._dimension = dimension
+            self._bank = np.empty((self._capacity, dimension), dtype=np.float32)
+        elif dimension != self._dimension:
+            raise ValueError(
+                f"Embedding dimension {dimension} does not match repository dimension {self._dimension}"
+            )
+
+    def _grow(self) -> None:
+        capacity = max(self._capacity * 2, 1)
+        bank = np.empty((capacity, self._dimension), dtype=np.float32)
+        bank[: self._size] = self._bank[: self._size]
+        norms = np.empty(capacity, dtype=np.float32)
+        norms[: self._size] = self._norms[: self._size]
+        statuses = np.empty(capacity, dtype=np.uint8)
+        statuses[: self._size] = self._statuses[: self._size]
+        self._bank, self._norms, self._statuses = bank, norms, statuses
+        self._capacity = capacity
+
+    def _ensure_writable(self) -> None:
+        # A read-only memory-mapped bank is copied into RAM on first write
+        if not self._bank.flags.writeable:
+            self._bank = np.array(self._bank)
+
+    def _write_row(self, row: int, embedding: Embedding) -> None:
+        self._ensure_writable()
+        values = np.asarray(embedding.vector.values, dtype=np.float32)
+        self._bank[row] = values
+        self._norms[row] = np.linalg.norm(values)
+        self._statuses[row] = embedding.status
+        self._models[row] = embedding.vector.model
+        self._metadata[row] = embedding.metadata
+        self._types[row] = embedding.embedding_type
+        self._created_at[row] = embedding.created_at
+        self._updated_at[row] = embedding.updated_at
+        self._tags[row] = embedding.tags
+        self._versions[row] = embedding.version
+
+    def _append_row(self, embedding: Embedding) -> None:
+        if self._size == self._capacity:
+            self._grow()
+        row = self._size
+        for column in self._columns():
+            column.append(None)
+        self._ids[row] = embedding.id
+        self._write_row(row, embedding)
+        self._id_to_row[embedding.id] = row
+        self._size += 1
+
+    def _remove_row(self, row: int) -> None:
+        last = self._size - 1
+        removed_id = self._ids[row]
+        if row != last:
+            self._ensure_writable()
+            # Back-fill the hole with the last row to keep the bank dense
+            self._bank[row] = self._bank[last]
+            self._norms[row] = self._norms[last]
+            self._statuses[row] = self._statuses[last]
+            for column in self._columns():
+                column[row] = column[last]
+            self._id_to_row[self._ids[row]] = row
+        for column in self._columns():
+            column.pop()
+        del self._id_to_row[removed_id]
+        self._size -= 1
+
+    def _row_to_embedding(self, row: int) -> Embedding:
+        """Rebuild the domain entity for a single row"""
+        return Embedding(
+            id=self._ids[row],
+            vector=EmbeddingVector.create(self._bank[row].tolist(), self._models[row]),
+            metadata=self._metadata[row],
+            embedding_type=self._types[row],
+            status=_STATUSES[self._statuses[row]],
+            created_at=self._created_at[row],
+            updated_at=self._updated_at[row],
+            tags=self._tags[row],
+            version=self._versions[row],
+        )
+
+    # Embeddings
+    async def save_embedding(self, embedding: Embedding) -> Embedding:
+        self._ensure_bank(embedding.vector.dimension)
+        row = self._id_to_row.get(embedding.id)
+        if row is None:
+            self._append_row(embedding)
+        else:
+            self._write_row(row, embedding)
+        return embedding
+
+    async def find_embedding_by_id(self, embedding_id: str) -> Optional[Embedding]:
+        row = self._id_to_row.get(embedding_id)
+        return self._row_to_embedding(row) if row is not None else None
+
+    async def find_embeddings_by_source(self, source_type: str, source_id: str) -> List[Embedding]:
+        return [
+            self._row_to_embedding(row)
+            for row, metadata in enumerate(self._metadata)
+            if metadata.source_id == source_id and metadata.source_type == source_type
+        ]
+
+    async def delete_embedding(self, embedding_id: str) -> bool:
+        row = self._id_to_row.get(embedding_id)
+        if row is None:
+            return False
+        self._remove_row(row)
+        return True
+
+    # Models
+    async def save_model(self, model: EmbeddingModel) -> EmbeddingModel:
+        self._embedding_models[model.id] = model
+        return model
+
+    async def find_model_by_id(self, model_id: str) -> Optional[EmbeddingModel]:
+        return self._embedding_models.get(model_id)
+
+    async def find_model_by_name(self, name: str) -> Optional[EmbeddingModel]:
+        return next((m for m in self._embedding_models.values() if m.name == name), None)
+
+    async def find_active_models(self) -> List[EmbeddingModel]:
+        return [m for m in self._embedding_models.values() if m.is_active]
+
+    async def delete_model(self, model_id: str) -> bool:
+        return self._embedding_models.pop(model_id, None) is not None
+
+    # Search & maintenance
+    async def search_similar_embeddings(self, query_vector: List[float],
+                                        limit: int = 10,
+                                        threshold: float = 0.7) -> List[Dict[str, Any]]:
+        if self._size == 0 or limit <= 0:
+            return []
+
+        query = np.asarray(query_vector, dtype=np.float32)
+        if query.shape[0] != self._dimension:
+            raise ValueError("Query vector dimension does not match repository dimension")
+        query_norm = np.linalg.norm(query)
+        if query_norm == 0:
+            return []
+
+        norms = self._norms[: self._size]
+        scores = self._bank[: self._size] @ (query / query_norm)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scores = np.where(norms > 0, scores / norms, 0.0)
+
+        k = min(limit, self._size)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        return [
+            self._row_to_embedding(row).to_search_result(score=float(scores[row]))
+            for row in top
+            if scores[row] >= threshold
+        ]
+
+    async def get_embedding_statistics(self) -> Dict[str, Any]:
+        status_counts = np.bincount(self._statuses[: self._size], minlength=len(_STATUSES))
+        type_counts: Dict[str, int] = {}
+        for embedding_type in self._types:
+            type_counts[embedding_type.value] = type_counts.get(embedding_type.value, 0) + 1
+        return {
+            "total_embeddings": self._size,
+            "dimension": self._dimension,
+            "by_status": {EmbeddingStatus.name_of(status): int(status_counts[status]) for status in _STATUSES},
+            "by_type": type_counts,
+            "total_models": len(self._embedding_models),
+        }
+
+    async def cleanup_old_embeddings(self, days_old: int = 90) -> int:
+        cutoff = datetime.utcnow() - timedelta(days=days_old)
+        # Walk backwards so back-filled rows have already been inspected
+        stale_rows = [row for row in range(self._size - 1, -1, -1) if self._created_at[row] < cutoff]
+        for row in stale_rows:
+            self._remove_row(row)
+        return len(stale_rows)
+
+    # Persistence
+    def persist(self, directory: Union[str, Path]) -> None:
+        """Write the bank as NPY files plus a JSON sidecar of row metadata"""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        if self._bank is None:
+            raise ValueError("Cannot persist an empty repository")
+
+        np.save(directory / _BANK_FILE, self._bank[: self._size])
+        np.save(directory / _NORMS_FILE, self._norms[: self._size])
+        np.save(directory / _STATUSES_FILE, self._statuses[: self._size])
+        rows = {
+            "ids": self._ids,
+            "models": self._models,
+            "metadata": [
+                [m.source_type, m.source_id, m.content_preview, m.tokens_used, m.processing_time_ms]
+                for m in self._metadata
+            ],
+            "types": [t.value for t in self._types],
+            "created_at": self._created_at,
+            "updated_at": self._updated_at,
+            "tags": self._tags,
+            "versions": self._versions,
+        }
+        (directory / _ROWS_FILE).write_bytes(orjson.dumps(rows))
+
+    @classmethod
+    def open_mmap(cls, directory: Union[str, Path], mmap_mode: str = "r") -> "InMemoryEmbeddingRepository":
+        """
+        Open a persisted bank without reading the vectors into memory.
+        Pages are faulted in on demand and shared through the OS page cache.
+        """
+        directory = Path(directory)
+        bank = np.load(directory / _BANK_FILE, mmap_mode=mmap_mode)
+        rows = orjson.loads((directory / _ROWS_FILE).read_bytes())
+
+        size, dimension = bank.shape
+        repository = cls(dimension=dimension, initial_capacity=size)
+        repository._bank = bank
+        repository._norms = np.load(directory / _NORMS_FILE)
+        repository._statuses = np.load(directory / _STATUSES_FILE)
+        repository._size = size
+        repository._capacity = size
+
+        repository._ids = rows["ids"]
+        repository._models = rows["models"]
+        repository._metadata = [EmbeddingMetadata(*m) for m in rows["metadata"]]
+        repository._types = [EmbeddingType(t) for t in rows["types"]]
+        repository._created_at = [datetime.fromisoformat(d) for d in rows["created_at"]]
+        repository._updated_at = [datetime.fromisoformat(d) for d in rows["updated_at"]]
+        repository._tags = rows["tags"]
+        repository._versions = rows["versions"]
+        repository._id_to_row = {embedding_id: row for row, embedding_id in enumerate(repository._ids)}
+        return repository
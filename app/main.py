@@ -18,6 +18,8 @@ from app.core.logger import setup_logging
 from app.api.v1 import api_router
 from app.wiring import init_database, close_database
 from app.core.logger import get_logger
+from app.domain.user.value_objects.password import use_breached_passwords
+from app.domain.user.value_objects.password_bloom import BloomFilter, load_top_passwords
 
 # Setup logging
 logger = setup_logging(
@@ -55,6 +57,18 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Database initialization failed: {e}")
     
+    # Load breached password filter
+    if settings.breached_passwords_bloom_path:
+        try:
+            top_passwords = (
+                load_top_passwords(settings.breached_passwords_top_path)
+                if settings.breached_passwords_top_path else None
+            )
+            use_breached_passwords(BloomFilter.open(settings.breached_passwords_bloom_path), top_passwords)
+            logger.info("Breached password filter loaded")
+        except Exception as e:
+            logger.error(f"Breached password filter loading failed: {e}")
+    
     # Initialize Redis cache
     # await init_redis()
     
@@ -2,11 +2,11 @@
 Dependency Injection Wiring
 """
 from typing import AsyncGenerator
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.core.config import settings
-from app.infrastructure.db.base import Base
+from app.infrastructure.db.base import Base, engine, async_session_maker, create_indexes, warm_up_pool
 from app.infrastructure.db.session import get_async_session
 from app.infrastructure.db.repository_impl.chat_repository_impl import SQLAlchemyChatRepository
 from app.infrastructure.db.repository_impl.document_repository_impl import SQLAlchemyDocumentRepository
@@ -20,23 +20,16 @@ from app.core.logger import get_logger
 logger = get_logger(__name__)
 
 
-# Database setup
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.debug,
-    pool_pre_ping=True,
-    pool_recycle=300
-)
-
-AsyncSessionLocal = sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False
-)
+# Database setup: one engine and session factory, configured in db.base
+AsyncSessionLocal = async_session_maker
 
 
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
-    """Get database session"""
+    """
+    Get the request's database session. Nothing is committed here: code after
+    the yield runs once the response has been sent, so the endpoint commits
+    its unit of work itself (async with session.begin()) before returning.
+    """
     async with AsyncSessionLocal() as session:
         try:
             yield session
@@ -48,28 +41,25 @@ async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
-# Repository dependencies
-async def get_chat_repository(session: AsyncSession = None) -> SQLAlchemyChatRepository:
+def get_session_factory() -> async_sessionmaker:
+    """Get the session factory, for work that runs on sibling sessions (fetch_document_bundle, fetch_user_aggregate)"""
+    return AsyncSessionLocal
+
+
+# Repository dependencies: repositories share the request's session from
+# get_db_session and only flush; the endpoint commits the unit of work
+async def get_chat_repository(session: AsyncSession = Depends(get_db_session)) -> SQLAlchemyChatRepository:
     """Get chat repository"""
-    if session is None:
-        async with AsyncSessionLocal() as session:
-            return SQLAlchemyChatRepository(session)
     return SQLAlchemyChatRepository(session)
 
 
-async def get_document_repository(session: AsyncSession = None) -> SQLAlchemyDocumentRepository:
+async def get_document_repository(session: AsyncSession = Depends(get_db_session)) -> SQLAlchemyDocumentRepository:
     """Get document repository"""
-    if session is None:
-        async with AsyncSessionLocal() as session:
-            return SQLAlchemyDocumentRepository(session)
     return SQLAlchemyDocumentRepository(session)
 
 
-async def get_embedding_repository(session: AsyncSession = None) -> SQLAlchemyEmbeddingRepository:
+async def get_embedding_repository(session: AsyncSession = Depends(get_db_session)) -> SQLAlchemyEmbeddingRepository:
     """Get embedding repository"""
-    if session is None:
-        async with AsyncSessionLocal() as session:
-            return SQLAlchemyEmbeddingRepository(session)
     return SQLAlchemyEmbeddingRepository(session)
 
 
@@ -89,22 +79,24 @@ def get_llm_service() -> LLMService:
     return LLMService(openai_adapter)
 
 
-async def get_search_service() -> SearchService:
+async def get_search_service(session: AsyncSession = Depends(get_db_session)) -> SearchService:
     """Get search service"""
-    document_repo = await get_document_repository()
-    embedding_repo = await get_embedding_repository()
+    document_repo = await get_document_repository(session)
+    embedding_repo = await get_embedding_repository(session)
     llm_service = get_llm_service()
     return SearchService(document_repo, embedding_repo, llm_service)
 
 
 # Use case dependencies
-async def get_process_chat_query_use_case() -> ProcessChatQueryUseCase:
+async def get_process_chat_query_use_case(
+    session: AsyncSession = Depends(get_db_session),
+) -> ProcessChatQueryUseCase:
     """Get process chat query use case"""
-    chat_repo = await get_chat_repository()
-    document_repo = await get_document_repository()
-    embedding_repo = await get_embedding_repository()
+    chat_repo = await get_chat_repository(session)
+    document_repo = await get_document_repository(session)
+    embedding_repo = await get_embedding_repository(session)
     llm_service = get_llm_service()
-    search_service = await get_search_service()
+    search_service = await get_search_service(session)
     
     return ProcessChatQueryUseCase(
         chat_repository=chat_repo,
@@ -161,7 +153,9 @@ async def init_database():
     try:
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
+            await create_indexes(conn)
         logger.info("Database tables created successfully")
+        await warm_up_pool()
     except Exception as e:
         logger.error(f"Error creating database tables: {str(e)}")
         raise
@@ -0,0 +1,3 @@
+"""
+Domain Unit Tests
+"""
@@ -0,0 +1,3 @@
+"""
+User Domain Unit Tests
+"""
@@ -0,0 +1,54 @@
+"""
+Email Value Object Tests
+"""
+import random
+import re
+
+import pytest
+
+from app.domain.user.value_objects.email import Email, is_valid_email
+
+
+# Pattern of the original regex-based validator
+LEGACY_PATTERN = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+
+
+def sample_addresses():
+    """Hand-picked edge cases plus seeded random strings"""
+    fixed = [
+        "user@example.com", "first.last+tag@sub.example.co", "a@b.cd", "a@b.c",
+        "@example.com", "user@", "user@.com", "user@example.", "user@example.c0m",
+        "user@@example.com", "us er@example.com", "user@exa_mple.com", "user@a..co",
+        "user@-.co", "ü@example.com", "user@exämple.com", "user@example.cöm",
+        "user@example.com.x1", "user%x@example.org", "user@example",
+    ]
+    rng = random.Random(1234)
+    alphabet = "ab9._%+-@ü"
+    generated = [
+        "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 12))) + rng.choice(("", ".io", ".c"))
+        for _ in range(3000)
+    ]
+    return fixed + generated
+
+
+def test_is_valid_email_matches_legacy_pattern():
+    for value in sample_addresses():
+        assert is_valid_email(value) == (LEGACY_PATTERN.fullmatch(value) is not None), value
+
+
+def test_email_is_normalized_and_split():
+    email = Email("  User@Example.COM ")
+
+    assert email.value == "user@example.com"
+    assert email.username == "user"
+    assert email.domain == "example.com"
+
+
+def test_invalid_email_is_rejected():
+    with pytest.raises(ValueError, match="Invalid email format"):
+        Email("user@example")
+
+
+def test_overlong_email_is_rejected():
+    with pytest.raises(ValueError, match="longer than 255"):
+        Email("a" * 250 + "@example.com")
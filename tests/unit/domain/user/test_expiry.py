@@ -0,0 +1,79 @@
+"""
+Session and Permission Expiry Tests
+"""
+from datetime import datetime, timedelta
+
+from app.domain.user.clock import utc_timestamp
+from app.domain.user.entities.permission import Permission, PermissionScope, PermissionType
+from app.domain.user.entities.session import Session
+
+
+def make_permission(**kwargs) -> Permission:
+    return Permission.create(
+        user_id="user-1", name="read:documents",
+        type=PermissionType.READ, scope=PermissionScope.DOCUMENTS, **kwargs
+    )
+
+
+def test_session_expiry_follows_expires_at():
+    session = Session.create_for_user("user-1", "token", expires_in_hours=1)
+
+    assert session._expires_ts == utc_timestamp(session.expires_at)
+    assert session.is_valid()
+
+
+def test_expired_session_is_invalid():
+    session = Session.create_for_user("user-1", "token", expires_in_hours=-1)
+
+    assert session.is_expired()
+    assert not session.is_valid()
+
+
+def test_session_refresh_resyncs_expiry():
+    session = Session.create_for_user("user-1", "token", expires_in_hours=-1)
+
+    session.refresh("new-token", "new-refresh", expires_in_hours=2)
+
+    assert session._expires_ts == utc_timestamp(session.expires_at)
+    assert not session.is_expired()
+    assert session.token == "new-token"
+    assert session.refresh_token == "new-refresh"
+
+
+def test_permission_without_expiry_never_expires():
+    permission = make_permission()
+
+    assert permission._expires_ts is None
+    assert not permission.is_expired()
+
+
+def test_permission_expiry_from_constructor():
+    permission = Permission(
+        id="p-1", user_id="user-1", name="read:documents",
+        type=PermissionType.READ, scope=PermissionScope.DOCUMENTS,
+        expires_at=datetime.utcnow() - timedelta(minutes=1),
+    )
+
+    assert permission.is_expired()
+    assert not permission.matches("read:documents", PermissionType.READ, PermissionScope.DOCUMENTS)
+
+
+def test_permission_extend_resyncs_expiry():
+    permission = make_permission()
+
+    permission.extend(-1)
+    assert permission._expires_ts == utc_timestamp(permission.expires_at)
+    assert permission.is_expired()
+
+    permission.extend(2)
+    assert permission._expires_ts == utc_timestamp(permission.expires_at)
+    assert not permission.is_expired()
+
+
+def test_permission_match_key():
+    permission = make_permission(resource="doc-1")
+
+    assert permission.match_key == ("read:documents", PermissionType.READ, PermissionScope.DOCUMENTS)
+    assert permission.matches("read:documents", PermissionType.READ, PermissionScope.DOCUMENTS, "doc-1")
+    assert not permission.matches("read:documents", PermissionType.READ, PermissionScope.DOCUMENTS, "doc-2")
+    assert not permission.matches("read:documents", PermissionType.WRITE, PermissionScope.DOCUMENTS)
@@ -0,0 +1,46 @@
+"""
+Identifier Generation Tests
+"""
+import time
+import uuid
+
+from app.domain.user import ids
+
+
+def check_uuid7_layout(value: str, before_ms: int, after_ms: int) -> None:
+    parsed = uuid.UUID(value)
+    assert str(parsed) == value
+    assert parsed.version == 7
+    assert parsed.variant == uuid.RFC_4122
+    assert before_ms <= parsed.int >> 80 <= after_ms
+
+
+def test_new_id_is_canonical_uuid7():
+    before_ms = time.time_ns() // 1_000_000
+    value = ids.new_id()
+    after_ms = time.time_ns() // 1_000_000
+
+    check_uuid7_layout(value, before_ms, after_ms)
+
+
+def test_fallback_is_canonical_uuid7(monkeypatch):
+    # Exercise the pure-Python path even where uuid.uuid7 exists
+    monkeypatch.setattr(ids, "_uuid7", None)
+
+    before_ms = time.time_ns() // 1_000_000
+    values = [ids.new_id() for _ in range(100)]
+    after_ms = time.time_ns() // 1_000_000
+
+    for value in values:
+        check_uuid7_layout(value, before_ms, after_ms)
+    assert len(set(values)) == len(values)
+
+
+def test_ids_sort_by_creation_time(monkeypatch):
+    monkeypatch.setattr(ids, "_uuid7", None)
+
+    first = ids.new_id()
+    time.sleep(0.002)
+    second = ids.new_id()
+
+    assert first < second
@@ -0,0 +1,125 @@
+"""
+Password Value Object Tests
+"""
+import random
+import re
+
+import pytest
+
+from app.domain.user.value_objects.password import Password, use_breached_passwords
+from app.domain.user.value_objects.password_bloom import BloomFilter
+
+
+SPECIAL_CHARS = "!@#$%^&*()_+-=[]{}|;:,.<>?"
+
+
+def legacy_errors(value: str) -> list:
+    """Error list of the original regex/any()-based validator"""
+    errors = []
+    if len(value) < 8:
+        errors.append("Must be at least 8 characters long")
+    if len(value) > 128:
+        errors.append("Cannot be longer than 128 characters")
+    if not any(c.isupper() for c in value):
+        errors.append("Must contain at least one uppercase letter")
+    if not any(c.islower() for c in value):
+        errors.append("Must contain at least one lowercase letter")
+    if not any(c.isdigit() for c in value):
+        errors.append("Must contain at least one digit")
+    if not any(c in SPECIAL_CHARS for c in value):
+        errors.append(f"Must contain at least one special character ({SPECIAL_CHARS})")
+
+    lower_value = value.lower()
+    weak = (
+        any(re.search(pattern, lower_value) for pattern in (
+            r'(.)\1{2,}',
+            r'(012|123|234|345|456|567|678|789|890)',
+            r'(abc|bcd|cde|def|efg|fgh|ghi|hij|ijk|jkl|klm|lmn|mno|nop|opq|pqr|qrs|rst|stu|tuv|uvw|vwx|wxy|xyz)',
+        ))
+        or any(word in lower_value for word in (
+            'password', 'qwerty', 'admin', 'letmein', 'welcome',
+            'monkey', 'dragon', 'master', 'superman'
+        ))
+    )
+    if weak:
+        errors.append("Password contains weak patterns")
+    return errors
+
+
+def legacy_strength(value: str) -> str:
+    """Strength of the original calculate_strength"""
+    score = (len(value) >= 8) + (len(value) >= 12) + (len(value) >= 16)
+    score += any(c.isupper() for c in value)
+    score += any(c.islower() for c in value)
+    score += any(c.isdigit() for c in value)
+    score += any(c in SPECIAL_CHARS for c in value)
+    if len(set(value)) >= len(value) * 0.7:
+        score += 1
+    if score <= 3:
+        return "weak"
+    elif score <= 5:
+        return "medium"
+    elif score <= 7:
+        return "strong"
+    return "very_strong"
+
+
+def sample_passwords():
+    """Hand-picked edge cases plus seeded random strings, including non-ASCII characters"""
+    fixed = [
+        "Xk9#mQ2!", "Xk9#mQ2", "xk9#mq2!", "XK9#MQ2!", "Xk#mQ!zz", "Xk9mQ2zz",
+        "Xk9#mQ2!aaa", "Xk9#mQ2!123", "Xk9#abcQ2!", "MyPassword9!", "Adm1n#Qx",
+        "Éclair9#x", "ñandú#9X", "Ωmega#9x", "Zx9#٣qwQ", "Zx#qwQ²rT", "ǅx9#qwQr",
+        "Xk9#mQ2!" * 16, "Xk9#mQ2!" * 17,
+    ]
+    rng = random.Random(1234)
+    alphabet = "aZ9#bY8!cX7?dW6_eV5-É ñΩ٣²ǅß"
+    generated = [
+        "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 20)))
+        for _ in range(2000)
+    ]
+    return fixed + generated
+
+
+@pytest.fixture(autouse=True)
+def no_breached_passwords():
+    """Every test starts and ends without a breached-password filter"""
+    use_breached_passwords(None)
+    yield
+    use_breached_passwords(None)
+
+
+def test_validation_matches_legacy_rules():
+    for value in sample_passwords():
+        expected = legacy_errors(value)
+        if expected:
+            with pytest.raises(ValueError) as error:
+                Password(value)
+            assert str(error.value) == f"Password validation failed: {'; '.join(expected)}", value
+        else:
+            assert Password(value).calculate_strength() == legacy_strength(value), value
+
+
+def test_empty_password_is_rejected():
+    with pytest.raises(ValueError, match="cannot be empty"):
+        Password("")
+
+
+def test_bloom_hit_is_rejected_as_possibly_breached_without_exact_list():
+    use_breached_passwords(BloomFilter.build(["Zx9#qwQr"]))
+
+    with pytest.raises(ValueError, match="may have appeared in a data breach"):
+        Password("Zx9#qwQr")
+
+
+def test_bloom_hit_is_confirmed_against_exact_list():
+    use_breached_passwords(BloomFilter.build(["Zx9#qwQr"]), frozenset({"zx9#qwqr"}))
+
+    with pytest.raises(ValueError, match="has appeared in a data breach"):
+        Password("Zx9#qwQr")
+
+
+def test_bloom_false_positive_is_accepted_when_exact_list_misses():
+    use_breached_passwords(BloomFilter.build(["Zx9#qwQr"]), frozenset())
+
+    assert Password("Zx9#qwQr").calculate_strength() == legacy_strength("Zx9#qwQr")
@@ -0,0 +1,46 @@
+"""
+Password Bloom Filter Tests
+"""
+import pytest
+
+from app.domain.user.value_objects.password_bloom import BloomFilter, load_top_passwords
+
+
+WORDS = [f"Breached{i}!" for i in range(500)]
+
+
+def test_build_contains_every_word_case_insensitively():
+    bloom = BloomFilter.build(WORDS)
+
+    assert all(word in bloom for word in WORDS)
+    assert all(word.upper() in bloom for word in WORDS)
+
+
+def test_save_open_round_trip(tmp_path):
+    bloom = BloomFilter.build(WORDS, false_positive_rate=0.01)
+    path = tmp_path / "breached.bloom"
+
+    bloom.save(path)
+    opened = BloomFilter.open(path)
+
+    assert all(word in opened for word in WORDS)
+    # Same bits and hash count, so both give the same answer for unseen words too
+    unseen = [f"Unseen{i}?" for i in range(2000)]
+    assert [word in opened for word in unseen] == [word in bloom for word in unseen]
+    # 2000 unseen words at a 1% rate: allow generous slack over the expected ~20
+    assert sum(word in opened for word in unseen) < 100
+
+
+def test_open_rejects_other_files(tmp_path):
+    path = tmp_path / "not.bloom"
+    path.write_bytes(b"NOPE" + bytes(32))
+
+    with pytest.raises(ValueError, match="not a password bloom filter"):
+        BloomFilter.open(path)
+
+
+def test_load_top_passwords_lower_cases_and_skips_blank_lines(tmp_path):
+    path = tmp_path / "top.txt"
+    path.write_text("Password1!\n\nQWERTY99\r\n", encoding="utf-8")
+
+    assert load_top_passwords(path) == frozenset({"password1!", "qwerty99"})